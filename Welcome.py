@@ -1,9 +1,14 @@
 import streamlit as st
 from backend.sb_functions import sign_in, sign_up, load_user_data
+from backend.write_behind import get_write_buffer
 
 st.set_page_config(page_title="Study Planner", layout="wide")
 st.title("Study Planner")
 
+# Session state derived from the user's data, dropped whenever the user changes. A
+# saved_schedule_key only says which plan is stored for saves made by this login.
+DERIVED_KEYS = ["saved_schedule_key", "optimizer", "optimizer_key"]
+
 # Initialize session state
 for key in ["user", "uid", "courses", "settings", "schedule", "completions"]:
     if key not in st.session_state:
@@ -13,8 +18,12 @@ for key in ["user", "uid", "courses", "settings", "schedule", "completions"]:
 if st.session_state["uid"]:
     st.success(f"Logged in")
     if st.button("Log out"):
+        # Write out anything still buffered for this user; failures stay queued for retry
+        get_write_buffer().flush(st.session_state["uid"])
         for key in ["user", "uid", "courses", "settings", "schedule", "completions"]:
             st.session_state[key] = None if key in ["user", "uid"] else {}
+        for key in DERIVED_KEYS:
+            st.session_state.pop(key, None)
         st.rerun()
     st.info("Use the sidebar to navigate")
     st.stop()
@@ -34,10 +43,17 @@ with tab1:
                 res = sign_in(email, password)
                 uid = res.user.id
                 
+                # Load user data (after any writes still queued from an earlier session,
+                # which would otherwise be missing from it)
+                if not get_write_buffer().flush(uid):
+                    st.error("Changes from your last session are still being saved. Please try logging in again in a moment.")
+                    st.stop()
+                
                 st.session_state["user"] = res.user
                 st.session_state["uid"] = uid
+                for key in DERIVED_KEYS:
+                    st.session_state.pop(key, None)
                 
-                # Load user data
                 data = load_user_data(uid)
                 st.session_state["courses"] = data.get("courses", {})
                 st.session_state["settings"] = data.get("settings", {})
@@ -68,6 +84,8 @@ with tab2:
                 
                 st.session_state["user"] = res.user
                 st.session_state["uid"] = uid
+                for key in DERIVED_KEYS:
+                    st.session_state.pop(key, None)
                 st.session_state["courses"] = {}
                 st.session_state["settings"] = {}
                 st.session_state["schedule"] = {}
@@ -0,0 +1,280 @@
+import json
+import threading
+import time
+from types import SimpleNamespace
+
+import openai
+
+from backend import json_patch
+
+
+# Local stand-ins for external services, for tests and benchmarks
+
+
+class FakeOpenAIClient:
+
+    # Mimics openai.OpenAI().chat.completions.create() for the syllabus scraper.
+    # Every call returns `response` (a dict, serialized as the message content) after
+    # `latency` seconds; the first `rate_limited` calls raise openai.RateLimitError.
+    # With stream=True the content arrives in chunk_size pieces, chunk_latency apart.
+
+    def __init__(self, response=None, latency=0.0, rate_limited=0, chunk_size=16, chunk_latency=0.0):
+        self.response = response if response is not None else {
+            "course_info": {"course_code": "TEST100"},
+            "assessments": {"breakdown": [], "total_weight": 0},
+        }
+        self.latency = latency
+        self.rate_limited = rate_limited
+        self.chunk_size = chunk_size
+        self.chunk_latency = chunk_latency
+        self.calls = []
+        self._lock = threading.Lock()
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def _create(self, **kwargs):
+        with self._lock:
+            self.calls.append(kwargs)
+            limited = len(self.calls) <= self.rate_limited
+
+        if limited:
+            # Only the attributes openai's error classes read from an HTTP response
+            response = SimpleNamespace(status_code=429, headers={}, request=None)
+            raise openai.RateLimitError("Rate limit reached", response=response, body=None)
+
+        time.sleep(self.latency)
+        content = self.response if isinstance(self.response, str) else json.dumps(self.response)
+        if kwargs.get("stream"):
+            return self._stream(content)
+        message = SimpleNamespace(content=content)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+    def _stream(self, content):
+        for i in range(0, len(content), self.chunk_size):
+            time.sleep(self.chunk_latency)
+            delta = SimpleNamespace(content=content[i:i + self.chunk_size])
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=delta)])
+
+
+class FakeSupabaseClient:
+
+    # In-memory stand-in for the supabase-py client surface used in backend/:
+    # table(name).select(cols).eq(col, value).execute(), .upsert(row).execute() and
+    # .delete().eq(...).execute(). Rows are keyed by the table's primary key columns
+    # (user_id unless given in primary_keys). `latency` is added to every execute() to
+    # mimic a network round trip. With versioned=True rows carry the version column from
+    # backend/sql/delta_saves.sql, and rpc() runs the matching Python function from
+    # `functions` (the RPCs in backend/sql/ by default) against the in-memory tables;
+    # mapping a name to None makes it behave as not installed (FakeAPIError PGRST202).
+    # Install it with backend.supabase_client.use_client().
+
+    def __init__(self, latency=0.0, primary_keys=None, versioned=False, functions=None):
+        self.latency = latency
+        self.primary_keys = {**ROW_PRIMARY_KEYS, **(primary_keys or {})}
+        self.versioned = versioned
+        self.functions = {
+            "patch_user_json": fake_patch_user_json,
+            "save_schedule_rows": fake_save_schedule_rows,
+            "save_completion_rows": fake_save_completion_rows,
+            "upsert_course": fake_upsert_course,
+            "remove_course": fake_remove_course,
+            **(functions or {}),
+        }
+        self.tables = {}
+        self.requests = []
+        self._lock = threading.Lock()
+
+    def table(self, name):
+        return _FakeQuery(self, name)
+
+    def rpc(self, name, params):
+        return _FakeRpc(self, name, params)
+
+    def _key(self, table, row):
+        return tuple(row.get(col) for col in self.primary_keys.get(table, ("user_id",)))
+
+    def _execute(self, query):
+        time.sleep(self.latency)
+        with self._lock:
+            self.requests.append((query.table, query.action))
+            rows = self.tables.setdefault(query.table, {})
+
+            if query.action == "upsert":
+                out = []
+                for row in query.payload:
+                    key = self._key(query.table, row)
+                    merged = {**rows.get(key, {}), **json.loads(json.dumps(row))}
+                    if self.versioned:
+                        merged["version"] = rows[key]["version"] + 1 if key in rows else 0
+                    rows[key] = merged
+                    out.append(dict(merged))
+                return SimpleNamespace(data=out)
+
+            matched = [key for key, row in rows.items() if all(f(row) for f in query.filters)]
+            if query.action == "delete":
+                return SimpleNamespace(data=[rows.pop(key) for key in matched])
+
+            data = [json.loads(json.dumps(rows[key])) for key in matched]
+            if query.order_by:
+                data.sort(key=lambda row: [row.get(column) for column in query.order_by])
+            if query.page is not None:
+                data = data[query.page[0]:query.page[1] + 1]
+            if query.columns != ["*"]:
+                data = [{col: row.get(col) for col in query.columns} for row in data]
+            return SimpleNamespace(data=data)
+
+
+class _FakeQuery:
+
+    def __init__(self, client, table):
+        self.client = client
+        self.table = table
+        self.action = "select"
+        self.columns = ["*"]
+        self.filters = []
+        self.order_by = []
+        self.page = None
+        self.payload = None
+
+    def select(self, columns="*"):
+        self.action = "select"
+        self.columns = [c.strip() for c in columns.split(",")]
+        return self
+
+    def upsert(self, rows, **kwargs):
+        self.action = "upsert"
+        self.payload = rows if isinstance(rows, list) else [rows]
+        return self
+
+    def delete(self):
+        self.action = "delete"
+        return self
+
+    def eq(self, column, value):
+        self.filters.append(lambda row: row.get(column) == value)
+        return self
+
+    def gte(self, column, value):
+        self.filters.append(lambda row: row.get(column) >= value)
+        return self
+
+    def lte(self, column, value):
+        self.filters.append(lambda row: row.get(column) <= value)
+        return self
+
+    def order(self, column):
+        self.order_by.append(column)
+        return self
+
+    def range(self, start, end):
+        self.page = (start, end)
+        return self
+
+    def execute(self):
+        return self.client._execute(self)
+
+
+class FakeAPIError(Exception):
+
+    # Same code/message attributes as postgrest.exceptions.APIError
+
+    def __init__(self, code, message):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+
+class _FakeRpc:
+
+    def __init__(self, client, name, params):
+        self.client = client
+        self.name = name
+        self.params = json.loads(json.dumps(params))
+
+    def execute(self):
+        time.sleep(self.client.latency)
+        with self.client._lock:
+            self.client.requests.append((self.name, "rpc"))
+            function = self.client.functions.get(self.name)
+            if function is None:
+                raise FakeAPIError("PGRST202", f"Could not find the function public.{self.name}")
+            data = function(self.client, **self.params)
+        return SimpleNamespace(data=data)
+
+
+# Primary keys of the tables in backend/sql/relational_schedule.sql
+ROW_PRIMARY_KEYS = {
+    "schedule_days": ("user_id", "date"),
+    "schedule_tasks": ("user_id", "date", "position"),
+    "schedule_allocations": ("user_id", "assessment_id"),
+    "task_completions": ("user_id", "date", "task_id"),
+}
+
+
+# Same table -> column mapping as patch_user_json() in backend/sql/delta_saves.sql
+PATCHABLE_COLUMNS = {
+    "user_courses": "courses_json",
+    "user_settings": "settings_json",
+    "user_schedule": "schedule_json",
+    "user_task_completion": "completion_json",
+}
+
+
+def fake_patch_user_json(client, p_table, p_user_id, p_version, p_set, p_unset):
+    column = PATCHABLE_COLUMNS[p_table]
+    row = client.tables.get(p_table, {}).get((p_user_id,))
+    if row is None or row.get("version") != p_version:
+        return None
+    row[column] = json_patch.apply(row.get(column) or {}, p_set, p_unset)
+    row["version"] += 1
+    return row["version"]
+
+
+def _replace_user_rows(client, table, user_id, rows):
+    stored = client.tables.setdefault(table, {})
+    for key in [key for key, row in stored.items() if row["user_id"] == user_id]:
+        del stored[key]
+    for row in rows:
+        row = {"user_id": user_id, **row}
+        stored[client._key(table, row)] = row
+
+
+def fake_save_schedule_rows(client, p_user_id, p_days, p_tasks, p_allocations):
+    _replace_user_rows(client, "schedule_days", p_user_id, p_days)
+    _replace_user_rows(client, "schedule_tasks", p_user_id, p_tasks)
+    _replace_user_rows(client, "schedule_allocations", p_user_id, p_allocations)
+
+
+def fake_save_completion_rows(client, p_user_id, p_rows):
+    _replace_user_rows(client, "task_completions", p_user_id, p_rows)
+
+
+def _require_version_column(client):
+    # course_ops.sql reads user_courses.version, which only delta_saves.sql adds
+    if not client.versioned:
+        raise FakeAPIError("42703", 'column "version" does not exist')
+
+
+def fake_upsert_course(client, p_user_id, p_course_code, p_course, p_version=None):
+    _require_version_column(client)
+    rows = client.tables.setdefault("user_courses", {})
+    row = rows.get((p_user_id,))
+    if row is None:
+        rows[(p_user_id,)] = {"user_id": p_user_id, "courses_json": {p_course_code: p_course}, "version": 0}
+        return 0
+    if p_version is not None and row.get("version") != p_version:
+        return None
+    row["courses_json"] = {**(row.get("courses_json") or {}), p_course_code: p_course}
+    row["version"] = row.get("version", 0) + 1
+    return row["version"]
+
+
+def fake_remove_course(client, p_user_id, p_course_code, p_version=None):
+    _require_version_column(client)
+    row = client.tables.get("user_courses", {}).get((p_user_id,))
+    if row is None or (p_version is not None and row.get("version") != p_version):
+        return None
+    courses = dict(row.get("courses_json") or {})
+    courses.pop(p_course_code, None)
+    row["courses_json"] = courses
+    row["version"] = row.get("version", 0) + 1
+    return row["version"]
@@ -0,0 +1,71 @@
+import copy
+import json
+
+
+# Minimal structural diff for the JSON blobs in the user_* tables. A patch is a pair
+#
+#   sets:   [[path, value], ...]   # path is a list of keys (array indexes as strings)
+#   unsets: [path, ...]
+#
+# which is exactly what patch_user_json() in backend/sql/delta_saves.sql applies with
+# jsonb_set / #-. Dicts are diffed key by key and equal-length lists element by
+# element; anything else that changed is replaced whole.
+
+
+def diff(old, new):
+    sets = []
+    unsets = []
+    _diff(old, new, [], sets, unsets)
+    return sets, unsets
+
+
+def _diff(old, new, path, sets, unsets):
+    if isinstance(old, dict) and isinstance(new, dict):
+        for key in old:
+            if key not in new:
+                unsets.append(path + [key])
+        for key, value in new.items():
+            if key not in old:
+                sets.append([path + [key], value])
+            elif old[key] != value:
+                _diff(old[key], value, path + [key], sets, unsets)
+        return
+
+    if isinstance(old, list) and isinstance(new, list) and len(old) == len(new) and path:
+        for i, (a, b) in enumerate(zip(old, new)):
+            if a != b:
+                _diff(a, b, path + [str(i)], sets, unsets)
+        return
+
+    if old != new or type(old) is not type(new):
+        sets.append([path, new])
+
+
+def apply(doc, sets, unsets):
+    # Python twin of patch_user_json(), used by the offline Supabase stand-in
+    doc = copy.deepcopy(doc)
+    for path in unsets:
+        parent = _walk(doc, path[:-1])
+        if isinstance(parent, dict):
+            parent.pop(path[-1], None)
+    for path, value in sets:
+        if not path:
+            doc = copy.deepcopy(value)
+            continue
+        parent = _walk(doc, path[:-1])
+        key = path[-1]
+        if isinstance(parent, list):
+            parent[int(key)] = copy.deepcopy(value)
+        elif isinstance(parent, dict):
+            parent[key] = copy.deepcopy(value)
+    return doc
+
+
+def _walk(doc, path):
+    for key in path:
+        doc = doc[int(key)] if isinstance(doc, list) else doc.get(key)
+    return doc
+
+
+def patch_size(sets, unsets):
+    return len(json.dumps([sets, unsets], separators=(",", ":")))
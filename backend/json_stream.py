@@ -0,0 +1,83 @@
+import json
+
+
+class BreakdownStreamParser:
+
+    # Incrementally scans a streamed JSON document and returns each object of the
+    # "breakdown" array as soon as its closing brace arrives, so assessments can be
+    # shown before the whole completion has been received. feed() is O(chunk length).
+
+    def __init__(self, key="breakdown"):
+        self.key = key
+        self.text = []
+        self._buffer = ""
+        self._pos = 0
+
+        self._stack = []          # open containers: "{" or "["
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._last_string = None
+        self._current_key = None  # key of the value being parsed in the innermost object
+        self._array_depth = None  # stack depth of the target array, once it has opened
+        self._item_start = None
+
+    def feed(self, chunk):
+        self.text.append(chunk)
+        self._buffer += chunk
+        items = []
+
+        buf = self._buffer
+        for i in range(self._pos, len(buf)):
+            c = buf[i]
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif c == "\\":
+                    self._escape = True
+                elif c == '"':
+                    self._in_string = False
+                    self._last_string = buf[self._string_start:i]
+                continue
+
+            if c == '"':
+                self._in_string = True
+                self._string_start = i + 1
+            elif c == ":":
+                self._current_key = self._last_string
+            elif c in "{[":
+                if (
+                    c == "["
+                    and self._array_depth is None
+                    and self._stack[-1:] == ["{"]
+                    and self._current_key == self.key
+                ):
+                    self._array_depth = len(self._stack) + 1
+                self._stack.append(c)
+                if c == "{" and self._array_depth is not None and len(self._stack) == self._array_depth + 1:
+                    self._item_start = i
+            elif c in "}]":
+                if self._stack:
+                    self._stack.pop()
+                if c == "}" and self._item_start is not None and len(self._stack) == self._array_depth:
+                    items.append(json.loads(buf[self._item_start:i + 1]))
+                    self._item_start = None
+                if c == "]" and self._array_depth is not None and len(self._stack) == self._array_depth - 1:
+                    self._array_depth = -1  # done; ignore any later array with the same key
+
+        # Only the unfinished item (if any) needs to stay buffered
+        keep_from = self._item_start if self._item_start is not None else len(buf)
+        if self._in_string:
+            keep_from = min(keep_from, self._string_start)
+        self._buffer = buf[keep_from:]
+        self._pos = len(buf) - keep_from
+        if self._item_start is not None:
+            self._item_start -= keep_from
+        if self._in_string:
+            self._string_start -= keep_from
+
+        return items
+
+    def result(self):
+        return json.loads("".join(self.text))
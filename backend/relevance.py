@@ -0,0 +1,101 @@
+import re
+
+
+# Local pre-filter for syllabus text. Most of an outline (policies, accessibility
+# statements, reading lists) has nothing to do with assessments, so only sections that
+# look like grading or scheduling content are sent to the LLM, plus a little context.
+
+DEFAULT_TOKEN_BUDGET = 6000
+
+ASSESSMENT_WORDS = re.compile(
+    r"\b(assignments?|quiz(?:zes)?|mid-?terms?|finals?|exams?|examinations?|tests?|labs?|"
+    r"projects?|presentations?|essays?|reports?|participation|tutorials?|exercises?|"
+    r"grading|grades?|evaluation|assessments?|weights?|weighting|marks?|due|deadlines?|"
+    r"submissions?|submit)\b",
+    re.IGNORECASE,
+)
+
+DATE_PATTERNS = re.compile(
+    r"\b(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*\.?\s+\d{1,2}\b"
+    r"|\b\d{1,2}\s+(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*\b"
+    r"|\b\d{4}-\d{2}-\d{2}\b"
+    r"|\b\d{1,2}/\d{1,2}(?:/\d{2,4})?\b"
+    r"|\bweek\s+\d{1,2}\b"
+    r"|\b(?:monday|tuesday|wednesday|thursday|friday|saturday|sunday)\b",
+    re.IGNORECASE,
+)
+
+PERCENT = re.compile(r"\d+(?:\.\d+)?\s*%|\bpercent\b", re.IGNORECASE)
+
+# Course details the parser also needs for course_info
+HEADER_WORDS = re.compile(r"\b(instructor|professor|email|course code|office hours)\b|@", re.IGNORECASE)
+
+# Boilerplate that mentions exams or deadlines without defining any
+POLICY_WORDS = re.compile(
+    r"\b(accessibility|accommodations?|plagiarism|academic integrity|misconduct|copyright|"
+    r"mental health|wellness|land acknowledg\w*|privacy|recording|turnitin)\b",
+    re.IGNORECASE,
+)
+
+
+def estimate_tokens(text):
+    # Rough count for English text; good enough to size a budget
+    return len(text) // 4 + 1
+
+
+def split_sections(text, lines_per_section=8):
+    sections = [p.strip() for p in re.split(r"\n\s*\n", text) if p.strip()]
+    if len(sections) >= 3:
+        return sections
+
+    # PDF extraction often has no blank lines; fall back to fixed line windows
+    lines = [line for line in text.splitlines() if line.strip()]
+    return [
+        "\n".join(lines[i:i + lines_per_section])
+        for i in range(0, len(lines), lines_per_section)
+    ]
+
+
+def score_section(section):
+    return (
+        2 * len(ASSESSMENT_WORDS.findall(section))
+        + 3 * len(DATE_PATTERNS.findall(section))
+        + 3 * len(PERCENT.findall(section))
+        + 2 * len(HEADER_WORDS.findall(section))
+        - 2 * len(POLICY_WORDS.findall(section))
+    )
+
+
+def select_relevant_text(text, token_budget=DEFAULT_TOKEN_BUDGET, margin=1, min_score=4):
+    # Returns the relevant sections of text (in original order) within token_budget.
+    # Falls back to the full text when it already fits, or when nothing looks like a
+    # grading section, since then the heuristics cannot be trusted.
+    if not text or estimate_tokens(text) <= token_budget:
+        return text
+
+    sections = split_sections(text)
+    scores = [score_section(s) for s in sections]
+    relevant = [i for i, score in enumerate(scores) if score >= min_score]
+
+    if not any(PERCENT.search(sections[i]) for i in relevant):
+        return text
+
+    # The first section usually holds the course code, name and instructor
+    keep = {0}
+    for i in relevant:
+        keep.update(range(max(0, i - margin), min(len(sections), i + margin + 1)))
+
+    # Over budget: drop the lowest-scoring sections first, keeping document order
+    chosen = sorted(keep)
+    total = sum(estimate_tokens(sections[i]) for i in chosen)
+    if total > token_budget:
+        for i in sorted(chosen, key=lambda i: (scores[i], -i)):
+            if total <= token_budget:
+                break
+            if i == 0:
+                continue
+            keep.discard(i)
+            total -= estimate_tokens(sections[i])
+        chosen = sorted(keep)
+
+    return "\n\n".join(sections[i] for i in chosen)
@@ -0,0 +1,186 @@
+import re
+from datetime import date, datetime, timedelta
+
+from backend.relevance import ASSESSMENT_WORDS
+
+
+# Rule-based extractor for syllabi with a clean "Assessment / Weight / Due" table.
+# Produces the same course_info / assessments.breakdown JSON as the LLM parser plus a
+# confidence in [0, 1]; SyllabusScraper only trusts it when confidence is high and the
+# weights add up to about 100.
+
+MONTHS = {
+    "jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6,
+    "jul": 7, "aug": 8, "sep": 9, "oct": 10, "nov": 11, "dec": 12,
+}
+
+COURSE_CODE = re.compile(r"\b([A-Z]{2,4})\s?-?(\d{3}[A-Z]?)\b")
+EMAIL = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+# Only the keyword and title are case-insensitive; name words must be capitalized and
+# separated by a single space or tab, so trailing text ("jsmith@...", "office hours")
+# is not swallowed
+INSTRUCTOR = re.compile(r"\b(?i:instructor|professor|lecturer)[ \t]*:?[ \t]*(?i:dr\.?[ \t]*|prof\.?[ \t]*)?([A-Z][\w'-]+(?:[ \t][A-Z][\w'-]+){0,2})")
+TERM = re.compile(r"\b(fall|winter|spring|summer)\s*(?:term|semester)?\s*,?\s*(\d{4})\b", re.IGNORECASE)
+
+# "Assignment 1 ..... 20% ..... Oct 5" (name first, a single weight, optional due date)
+ROW = re.compile(r"^\s*(?P<name>[A-Za-z][\w &/().#'-]{1,60}?)\s*[:|\-–.]*\s*(?P<weight>\d{1,3}(?:\.\d+)?)\s*%(?P<rest>.*)$")
+NOT_A_ROW = re.compile(r"\b(late|penalty|penalties|deduct\w*|lose|per day|bonus|extra credit|minimum|at least|pass)\b", re.IGNORECASE)
+
+ISO_DATE = re.compile(r"\b(\d{4})-(\d{2})-(\d{2})\b")
+MONTH_DAY = re.compile(r"\b(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?\s+(\d{1,2})(?:st|nd|rd|th)?\b", re.IGNORECASE)
+WEEK = re.compile(r"\bweek\s+(\d{1,2})\b", re.IGNORECASE)
+TIME = re.compile(r"\b(\d{1,2}):(\d{2})\s*([ap]\.?m\.?)?", re.IGNORECASE)
+
+# Plural category names ("Quizzes 15%") need the LLM to split them into items
+PLURAL_CATEGORY = re.compile(r"\b(assignments|quizzes|labs|tests|exercises|activities|reports|tutorials|presentations)\b", re.IGNORECASE)
+
+
+def _parse_due(text, semester_start, semester_end):
+    # Returns (ISO due date or None, whether the date came from a "Week X" reference)
+    due = None
+    from_week = False
+
+    m = ISO_DATE.search(text)
+    if m:
+        try:
+            due = date(int(m.group(1)), int(m.group(2)), int(m.group(3)))
+        except ValueError:
+            return None, False
+
+    if due is None:
+        m = MONTH_DAY.search(text)
+        if m:
+            month = MONTHS[m.group(1).lower()[:3]]
+            day = int(m.group(2))
+            # Pick the year that puts the date inside (or nearest to) the semester
+            candidates = []
+            for year in {semester_start.year, semester_end.year}:
+                try:
+                    candidates.append(date(year, month, day))
+                except ValueError:
+                    pass
+            if not candidates:
+                return None, False
+            middle = semester_start + (semester_end - semester_start) / 2
+            due = min(candidates, key=lambda d: abs((d - middle).days))
+
+    if due is None:
+        m = WEEK.search(text)
+        if m:
+            # Same formula the LLM prompt uses for "Week X"
+            due = semester_start + timedelta(days=int(m.group(1)) * 7 - 1)
+            from_week = True
+
+    if due is None:
+        return None, False
+
+    m = TIME.search(text)
+    if m and not from_week:
+        hour, minute = int(m.group(1)), int(m.group(2))
+        meridiem = (m.group(3) or "").lower().replace(".", "")
+        if meridiem == "pm" and hour < 12:
+            hour += 12
+        elif meridiem == "am" and hour == 12:
+            hour = 0
+        if hour < 24 and minute < 60:
+            return f"{due.isoformat()}T{hour:02d}:{minute:02d}:00", from_week
+
+    return due.isoformat(), from_week
+
+
+def _course_info(text):
+    head = text[:3000]
+    info = {
+        "course_name": "",
+        "course_code": "",
+        "semester": "",
+        "year": "",
+        "instructor": {"name": "", "email": ""},
+    }
+
+    m = COURSE_CODE.search(head)
+    if m:
+        info["course_code"] = f"{m.group(1)}{m.group(2)}"
+        line_end = head.find("\n", m.end())
+        name = head[m.end():line_end if line_end != -1 else None].strip(" :-–|\t")
+        if name and len(name) <= 80:
+            info["course_name"] = name
+
+    m = TERM.search(head)
+    if m:
+        info["semester"] = m.group(1).title()
+        info["year"] = m.group(2)
+
+    m = INSTRUCTOR.search(head)
+    if m:
+        info["instructor"]["name"] = m.group(1).strip()
+
+    m = EMAIL.search(head)
+    if m:
+        info["instructor"]["email"] = m.group(0)
+
+    return info
+
+
+def parse_grading_table(text, semester_start, semester_end):
+    start = datetime.strptime(semester_start, "%Y-%m-%d").date()
+    end = datetime.strptime(semester_end, "%Y-%m-%d").date()
+
+    breakdown = []
+    plural_rows = 0
+    week_rows = 0
+    ambiguous = 0
+
+    for line in text.splitlines():
+        if "%" not in line or NOT_A_ROW.search(line):
+            continue
+
+        m = ROW.match(line)
+        if not m or not ASSESSMENT_WORDS.search(m.group("name")):
+            if ASSESSMENT_WORDS.search(line):
+                ambiguous += 1
+            continue
+
+        # More than one percentage on a line is a sub-breakdown or a policy, not a row
+        if "%" in m.group("rest"):
+            ambiguous += 1
+            continue
+
+        name = m.group("name").strip(" :-–|.")
+        due_date, from_week = _parse_due(m.group("rest"), start, end)
+        plural_rows += bool(PLURAL_CATEGORY.search(name))
+        week_rows += from_week
+
+        weight = float(m.group("weight"))
+        breakdown.append({
+            "type": name,
+            "weight": int(weight) if weight.is_integer() else weight,
+            "due_date": due_date,
+            "notes": None,
+        })
+
+    total = sum(a["weight"] for a in breakdown)
+    data = {
+        "course_info": _course_info(text),
+        "assessments": {
+            "breakdown": breakdown,
+            "total_weight": total,
+        },
+    }
+
+    if not breakdown:
+        return data, 0.0
+
+    dated = sum(1 for a in breakdown if a["due_date"]) / len(breakdown)
+    confidence = 0.5 + 0.5 * dated
+    if abs(total - 100) > 1:
+        confidence *= 0.3
+    if len(breakdown) < 2:
+        confidence *= 0.6
+    if not data["course_info"]["course_code"]:
+        confidence *= 0.7
+    confidence *= 0.4 ** min(plural_rows, 2)
+    confidence *= 0.8 ** min(week_rows, 3)
+    confidence *= 0.6 ** min(ambiguous, 3)
+
+    return data, round(confidence, 3)
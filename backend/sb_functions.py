@@ -1,105 +1,308 @@
-from backend.supabase_client import supabase
+import json
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from backend import json_patch
+from backend.supabase_client import get_client
+from utils.schedule_format import from_columnar, from_rows, to_columnar, to_rows
 
 # Authenication
 
 def sign_up(email, password):
-    return supabase.auth.sign_up({"email": email, "password": password})
+    return get_client().auth.sign_up({"email": email, "password": password})
 
 def sign_in(email, password):
-    return supabase.auth.sign_in_with_password({"email": email, "password": password})
+    return get_client().auth.sign_in_with_password({"email": email, "password": password})
 
 # Load User Data (Extract the _json field from each table's first row and return a dict)
 
-def load_user_data(uid):
-    out = {
-        "courses": {},
-        "settings": {},
-        "schedule": {},
-        "completions": {}
-    }
+# session_state key -> (table, JSON column)
+USER_TABLES = {
+    "courses": ("user_courses", "courses_json"),
+    "settings": ("user_settings", "settings_json"),
+    "schedule": ("user_schedule", "schedule_json"),
+    "completions": ("user_task_completion", "completion_json"),
+}
 
-    # Courses
-    res = supabase.table("user_courses") \
-        .select("courses_json") \
-        .eq("user_id", uid) \
-        .execute()
-    if res.data:
-        out["courses"] = res.data[0].get("courses_json") or {}
+# "blob" keeps each user's schedule and completions as one JSON document; "rows"
+# stores them per day (backend/sql/relational_schedule.sql) so they can be read a
+# week at a time and queried server-side
+SCHEDULE_STORAGE = os.environ.get("SCHEDULE_STORAGE", "blob")
 
-    # Settings
-    res = supabase.table("user_settings") \
-        .select("settings_json") \
-        .eq("user_id", uid) \
-        .execute()
-    if res.data:
-        out["settings"] = res.data[0].get("settings_json") or {}
+# Row tables used when SCHEDULE_STORAGE == "rows", with their key order for paging
+ROW_TABLES = {
+    "days": ("schedule_days", ("date",)),
+    "tasks": ("schedule_tasks", ("date", "position")),
+    "allocations": ("schedule_allocations", ("assessment_id",)),
+    "completions": ("task_completions", ("date", "task_id")),
+}
 
-    # Schedule
-    res = supabase.table("user_schedule") \
-        .select("schedule_json") \
-        .eq("user_id", uid) \
-        .execute()
-    if res.data:
-        out["schedule"] = res.data[0].get("schedule_json") or {}
+# PostgREST caps a response at 1000 rows by default, so row reads are paged
+ROW_PAGE_SIZE = 1000
 
-    # Completions
-    res = supabase.table("user_task_completion") \
-        .select("completion_json") \
+# The reads are independent, so they run concurrently: login waits for one round
+# trip instead of four
+_load_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="load_user_data")
+
+
+def _load_json(table, column, uid):
+    # select("*") also picks up the version column once delta_saves.sql is applied
+    res = get_client().table(table) \
+        .select("*") \
         .eq("user_id", uid) \
         .execute()
     if res.data:
-        out["completions"] = res.data[0].get("completion_json") or {}
+        doc = res.data[0].get(column) or {}
+        _remember(uid, table, doc, res.data[0].get("version"))
+        return doc
+    return {}
+
+
+def _load_rows(name, uid, start=None, end=None):
+    # start/end are inclusive ISO dates; None leaves that side open
+    table, order = ROW_TABLES[name]
+    rows = []
+    while True:
+        query = get_client().table(table).select("*").eq("user_id", uid)
+        if start is not None:
+            query = query.gte("date", start)
+        if end is not None:
+            query = query.lte("date", end)
+        for column in order:
+            query = query.order(column)
+        page = query.range(len(rows), len(rows) + ROW_PAGE_SIZE - 1).execute().data or []
+        rows.extend(page)
+        if len(page) < ROW_PAGE_SIZE:
+            return rows
 
-    return out
+
+def _completions_from_rows(rows):
+    completions = {}
+    for row in rows:
+        completions.setdefault(row["date"], []).append(row["task_id"])
+    return completions
+
+
+def load_user_data(uid):
+    rows = SCHEDULE_STORAGE == "rows"
+    futures = {
+        key: _load_pool.submit(_load_json, table, column, uid)
+        for key, (table, column) in USER_TABLES.items()
+        if not (rows and key in ("schedule", "completions"))
+    }
+    if rows:
+        parts = {name: _load_pool.submit(_load_rows, name, uid) for name in ROW_TABLES}
+        parts = {name: future.result() for name, future in parts.items()}
+
+    out = {key: future.result() for key, future in futures.items()}
+    if rows:
+        out["schedule"] = from_rows(parts["days"], parts["tasks"], parts["allocations"]) if parts["days"] else {}
+        out["completions"] = _completions_from_rows(parts["completions"])
+    else:
+        out["schedule"] = from_columnar(out["schedule"])
+    return {key: out[key] for key in USER_TABLES}
+
+
+# Week (or any date range) reads; only available with SCHEDULE_STORAGE == "rows".
+# The schedule has no allocations, since those are not tied to a date.
+def load_schedule_range(uid, start, end):
+    days = _load_pool.submit(_load_rows, "days", uid, start, end)
+    tasks = _load_pool.submit(_load_rows, "tasks", uid, start, end)
+    return from_rows(days.result(), tasks.result())
+
+def load_completions_range(uid, start, end):
+    return _completions_from_rows(_load_rows("completions", uid, start, end))
 
 # Save Functions
-def save_courses(uid, courses):
-    supabase.table("user_courses").upsert(
+
+# Last persisted document and row version per (uid, table). With a base to diff
+# against, a save sends only the changed paths to patch_user_json() (see
+# backend/sql/delta_saves.sql). Tables without the version column never get a base,
+# so they keep doing full upserts.
+PERSISTED_LIMIT = 256
+_persisted = OrderedDict()
+_persisted_lock = threading.Lock()
+
+
+def _remember(uid, table, doc, version):
+    key = (uid, table)
+    with _persisted_lock:
+        if version is None:
+            _persisted.pop(key, None)
+            return
+        # Snapshot: callers keep mutating the dicts in session_state
+        _persisted[key] = (json.loads(json.dumps(doc)), version)
+        _persisted.move_to_end(key)
+        while len(_persisted) > PERSISTED_LIMIT:
+            _persisted.popitem(last=False)
+
+
+def _save_json(uid, table, column, doc):
+    with _persisted_lock:
+        base = _persisted.get((uid, table))
+
+    if base is not None:
+        old, version = base
+        sets, unsets = json_patch.diff(old, doc)
+        if not sets and not unsets:
+            return
+
+        # A root replacement or a patch bigger than the document is cheaper as an upsert
+        whole = any(not path for path, _ in sets)
+        if not whole and json_patch.patch_size(sets, unsets) < len(json.dumps(doc, separators=(",", ":"))):
+            res = get_client().rpc(
+                "patch_user_json",
+                {
+                    "p_table": table,
+                    "p_user_id": uid,
+                    "p_version": version,
+                    "p_set": sets,
+                    "p_unset": unsets,
+                },
+            ).execute()
+            if res.data is not None:
+                _remember(uid, table, doc, res.data)
+                return
+            # The row changed since we last saw it: fall back to a full upsert
+
+    res = get_client().table(table).upsert(
         {
             "user_id": uid,
-            "courses_json": courses,
+            column: doc,
         }
     ).execute()
+    _remember(uid, table, doc, res.data[0].get("version") if res.data else None)
+
+
+def save_courses(uid, courses):
+    _save_json(uid, "user_courses", "courses_json", courses)
 
 def save_settings(uid, settings):
-    supabase.table("user_settings").upsert(
-        {
-            "user_id": uid,
-            "settings_json": settings,
-        }
-    ).execute()
+    _save_json(uid, "user_settings", "settings_json", settings)
 
-def save_schedule(uid, schedule):
-    supabase.table("user_schedule").upsert(
-        {
-            "user_id": uid,
-            "schedule_json": schedule,
-        }
-    ).execute()
+# columnar=True stores the compact form from utils.schedule_format; load_user_data
+# expands it back, so both shapes can live in the table
+def save_schedule(uid, schedule, columnar=False):
+    if SCHEDULE_STORAGE == "rows":
+        rows = to_rows(schedule)
+        get_client().rpc(
+            "save_schedule_rows",
+            {
+                "p_user_id": uid,
+                "p_days": rows["days"],
+                "p_tasks": rows["tasks"],
+                "p_allocations": rows["allocations"],
+            },
+        ).execute()
+        return
+    _save_json(uid, "user_schedule", "schedule_json", to_columnar(schedule) if columnar else schedule)
 
 def save_completions(uid, completions):
-    supabase.table("user_task_completion").upsert(
+    if SCHEDULE_STORAGE == "rows":
+        get_client().rpc(
+            "save_completion_rows",
+            {
+                "p_user_id": uid,
+                "p_rows": [
+                    {"date": day, "task_id": task_id}
+                    for day, task_ids in completions.items()
+                    for task_id in task_ids
+                ],
+            },
+        ).execute()
+        return
+    _save_json(uid, "user_task_completion", "completion_json", completions)
+
+# Atomic per-course edits (backend/sql/course_ops.sql): one server-side update of a
+# single key, so concurrent sessions editing other courses are never overwritten.
+# With version set the edit only applies if the row is still at that version.
+# Both return the new row version, or None if nothing was changed (or the table has
+# no version column). On a database without course_ops.sql or delta_saves.sql they
+# fall back to reading, editing and upserting the whole course map.
+
+# PostgREST "function not found", Postgres undefined_function and undefined_column
+COURSE_OPS_MISSING_CODES = {"PGRST202", "42883", "42703"}
+
+
+def upsert_course(uid, course_code, course, version=None):
+    return _course_edit(
+        "upsert_course",
         {
-            "user_id": uid,
-            "completion_json": completions,
-        }
-    ).execute()
+            "p_user_id": uid,
+            "p_course_code": course_code,
+            "p_course": course,
+            "p_version": version,
+        },
+        uid, course_code, course, version,
+    )
 
-def remove_course(uid, course_code):
-    res = supabase.table("user_courses") \
-        .select("courses_json") \
+def remove_course(uid, course_code, version=None):
+    return _course_edit(
+        "remove_course",
+        {
+            "p_user_id": uid,
+            "p_course_code": course_code,
+            "p_version": version,
+        },
+        uid, course_code, None, version,
+    )
+
+
+def _course_edit(function, params, uid, course_code, course, version):
+    try:
+        res = get_client().rpc(function, params).execute()
+    except Exception as e:
+        if getattr(e, "code", None) not in COURSE_OPS_MISSING_CODES:
+            raise
+        return _edit_courses_json(uid, course_code, course, version)
+    _apply_course_edit(uid, course_code, course, res.data)
+    return res.data
+
+
+def _edit_courses_json(uid, course_code, course, version):
+    res = get_client().table("user_courses") \
+        .select("*") \
         .eq("user_id", uid) \
         .execute()
+    row = res.data[0] if res.data else None
+    if version is not None and (row is None or row.get("version") != version):
+        return None
+    if row is None and course is None:
+        return None
 
-    if not res.data:
-        return {}
-    courses = res.data[0].get("courses_json") or {}
-    courses.pop(course_code, None)
-    supabase.table("user_courses").upsert(
+    courses = dict((row or {}).get("courses_json") or {})
+    if course is None:
+        courses.pop(course_code, None)
+    else:
+        courses[course_code] = course
+
+    res = get_client().table("user_courses").upsert(
         {
             "user_id": uid,
             "courses_json": courses,
         }
     ).execute()
+    new_version = res.data[0].get("version") if res.data else None
+    _remember(uid, "user_courses", courses, new_version)
+    return new_version
+
+
+def _apply_course_edit(uid, course_code, course, new_version):
+    # Keep the delta-save base in step if this edit is the only change since it was
+    # taken; otherwise drop it so the next save_courses starts from a full upsert
+    if new_version is None:
+        return
+    with _persisted_lock:
+        base = _persisted.get((uid, "user_courses"))
+    if base is None or base[1] != new_version - 1:
+        _remember(uid, "user_courses", None, None)
+        return
 
-    return courses
+    courses = dict(base[0])
+    if course is None:
+        courses.pop(course_code, None)
+    else:
+        courses[course_code] = course
+    _remember(uid, "user_courses", courses, new_version)
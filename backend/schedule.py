@@ -1,23 +1,84 @@
-from dataclasses import dataclass, field
+import heapq
+import os
+import re
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, date, timedelta
-from typing import List, Dict, Any
+from functools import partial
+from typing import List, Dict, Any, Iterable, Optional, Type
+
+import numpy as np
 
 
 DAY_NAMES = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
 
+# Allocation strategies accepted by ScheduleOptimizer(strategy=...):
+#   greedy - fill each assessment in list order, earliest window days first
+#   edf    - earliest-deadline-first sweep over the calendar
+#   flow   - min-cost max-flow over the assessment x day graph (fewest unscheduled hours)
+STRATEGIES = ("greedy", "edf", "flow")
+
+# Due date strings the vectorized engine converts in bulk (the formats strptime accepts
+# in ScheduleOptimizer._compute_work_window, with two-digit fields)
+DUE_DATE_FORMAT = re.compile(r"\d{4}-\d{2}-\d{2}(?:T(?:[01]\d|2[0-3]):[0-5]\d:[0-5]\d)?")
+
 
-@dataclass
 class DaySlot:
 
-    date: date
-    weekday: str
-    capacity: float
-    tasks: List[Dict[str, Any]] = field(default_factory=list)
+    __slots__ = ("date", "weekday", "capacity", "tasks", "used_hours")
+
+    def __init__(self, date: date, weekday: str, capacity: float, tasks: List[Dict[str, Any]] = None):
+        self.date = date
+        self.weekday = weekday
+        self.capacity = capacity
+        self.tasks = []
+        self.used_hours = 0.0
+        for t in tasks or []:
+            self.add_task(t)
+
+    def __repr__(self) -> str:
+        return f"DaySlot(date={self.date!r}, weekday={self.weekday!r}, capacity={self.capacity!r}, used_hours={self.used_hours!r})"
 
     @property
     def remaining(self) -> float:
-        used = sum(t["hours"] for t in self.tasks)
-        return max(self.capacity - used, 0.0)
+        return max(self.capacity - self.used_hours, 0.0)
+
+    def add_task(self, task: Dict[str, Any]) -> None:
+        # Keep a running total so remaining is O(1) instead of re-summing tasks
+        self.tasks.append(task)
+        self.used_hours += task["hours"]
+
+    def release(self, assessment_id: int) -> float:
+        # Drop an assessment's tasks and return how many hours it had here
+        kept = [t for t in self.tasks if t["assessment_id"] != assessment_id]
+        if len(kept) == len(self.tasks):
+            return 0.0
+        released = self.used_hours
+        self.tasks = kept
+        self.used_hours = sum((t["hours"] for t in kept), 0.0)
+        return released - self.used_hours
+
+    def detach_after(self, assessment_id: int) -> List[Dict[str, Any]]:
+        # Tasks are kept in assessment order; split off those of later assessments
+        i = len(self.tasks)
+        while i > 0 and self.tasks[i - 1]["assessment_id"] > assessment_id:
+            i -= 1
+        tail = self.tasks[i:]
+        if tail:
+            self.tasks = self.tasks[:i]
+            self.used_hours = sum((t["hours"] for t in self.tasks), 0.0)
+        return tail
+
+    def hours_for(self, assessment_id: int) -> float:
+        return sum((t["hours"] for t in self.tasks if t["assessment_id"] == assessment_id), 0.0)
+
+
+# Fields that decide how an assessment is allocated; replan() compares these
+ASSESSMENT_KEY_FIELDS = ("course_code", "type", "title", "due_date", "hours_required", "work_ahead_days")
+
+
+def _assessment_key(assessment: Dict[str, Any]) -> tuple:
+    return tuple(assessment.get(k) for k in ASSESSMENT_KEY_FIELDS)
 
 
 class ScheduleOptimizer:
@@ -28,13 +89,25 @@ class ScheduleOptimizer:
         semester_end: str,
         daily_hours: Dict[str, float],
         work_ahead_days: Dict[str, int],
+        strategy: str = "greedy",
     ):
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown strategy '{strategy}', expected one of {', '.join(STRATEGIES)}")
+
+        self.strategy = strategy
         self.semester_start = datetime.strptime(semester_start, "%Y-%m-%d").date()
         self.semester_end = datetime.strptime(semester_end, "%Y-%m-%d").date()
         self.daily_hours = {k.lower(): float(v) for k, v in daily_hours.items()}
         self.work_ahead_days = {k.lower(): int(v) for k, v in work_ahead_days.items()}
 
         self.days = self._build_day_slots()
+        self._index_days()
+
+        # State from the last full or incremental run, used by replan()
+        self._plan_keys = None
+        self._plan_windows = None
+        self._plan_summaries = None
+        self._day_entries = None
 
     # Calendar construction
 
@@ -49,8 +122,26 @@ class ScheduleOptimizer:
             current += timedelta(days=1)
         return days
 
+    def _index_days(self) -> None:
+        # Date -> position in self.days, plus the sorted dates of days that have capacity
+        self._day_index = {d.date: i for i, d in enumerate(self.days)}
+        self._open_days = [d for d in self.days if d.capacity > 0.0]
+        self._open_dates = [d.date for d in self._open_days]
+
     def _find_days_in_window(self, start: date, end: date) -> List[DaySlot]:
-        return [d for d in self.days if start <= d.date <= end and d.capacity > 0.0]
+        # Binary search over the open days: O(log n + window)
+        lo = bisect_left(self._open_dates, start)
+        hi = bisect_right(self._open_dates, end)
+        return self._open_days[lo:hi]
+
+    def _window_bounds(self, assessment: Dict[str, Any]) -> Optional[tuple]:
+        # Slice of self._open_days an assessment may use, or None if it is skipped
+        due_date = assessment.get("due_date")
+        if not due_date or float(assessment.get("hours_required", 0.0)) <= 0:
+            return None
+        atype = (assessment.get("type") or "unknown").lower()
+        start, end = self._compute_work_window(due_date, atype, assessment.get("work_ahead_days"))
+        return bisect_left(self._open_dates, start), bisect_right(self._open_dates, end)
 
     def _round_to_half_hour(self, hours: float) -> float:
         return round(hours * 2) / 2
@@ -84,12 +175,7 @@ class ScheduleOptimizer:
         hours_required = float(assessment.get("hours_required", 0.0))
 
         if not due_date or hours_required <= 0:
-            return {
-                "assessment_id": assessment_id,
-                "scheduled_hours": 0.0,
-                "unscheduled_hours": hours_required,
-                "status": "skipped_missing_date_or_zero_hours",
-            }
+            return self._unscheduled_summary(assessment_id, hours_required, "skipped_missing_date_or_zero_hours")
 
         start, end = self._compute_work_window(due_date, atype, assessment.get("work_ahead_days"))
         window_days = self._find_days_in_window(start, end)
@@ -98,12 +184,7 @@ class ScheduleOptimizer:
 
             # No available days in window
 
-            return {
-                "assessment_id": assessment_id,
-                "scheduled_hours": 0.0,
-                "unscheduled_hours": hours_required,
-                "status": "no_available_days",
-            }
+            return self._unscheduled_summary(assessment_id, hours_required, "no_available_days")
 
         remaining = hours_required
 
@@ -116,32 +197,53 @@ class ScheduleOptimizer:
             available = d.remaining
             if available < 0.25:
                 continue
-            
-            # Allocate as much as possible to this day (up to remaining)
-            alloc = min(available, remaining)
-            
-            # Round to 0.5 hour increments
-            alloc_rounded = self._round_to_half_hour(alloc)
-            
-            # If rounding up would exceed capacity or remaining, round down
-            if alloc_rounded > available or alloc_rounded > remaining:
-                alloc_rounded = self._round_to_half_hour(alloc - 0.25)
-            
-            # Skip if rounded value is invalid
-            if alloc_rounded <= 0 or alloc_rounded > available:
+
+            alloc_rounded = self._round_allocation(available, remaining)
+            if alloc_rounded <= 0:
                 continue
-            
+
             # Record this allocation
-            d.tasks.append({
-                "assessment_id": assessment_id,
-                "course_code": assessment.get("course_code"),
-                "type": assessment.get("type"),
-                "title": assessment.get("title") or assessment.get("type"),
-                "due_date": due_date,
-                "hours": alloc_rounded,
-            })
+            d.add_task(self._make_task(assessment, assessment_id, alloc_rounded))
             remaining -= alloc_rounded
 
+        return self._final_summary(assessment_id, hours_required, remaining)
+
+    def _round_allocation(self, available: float, remaining: float) -> float:
+
+        # Allocate as much as possible to this day (up to remaining)
+        alloc = min(available, remaining)
+
+        # Round to 0.5 hour increments
+        alloc_rounded = self._round_to_half_hour(alloc)
+
+        # If rounding up would exceed capacity or remaining, round down
+        if alloc_rounded > available or alloc_rounded > remaining:
+            alloc_rounded = self._round_to_half_hour(alloc - 0.25)
+
+        # Nothing fits if the rounded value is invalid
+        if alloc_rounded <= 0 or alloc_rounded > available:
+            return 0.0
+        return alloc_rounded
+
+    def _make_task(self, assessment: Dict[str, Any], assessment_id: int, hours: float) -> Dict[str, Any]:
+        return {
+            "assessment_id": assessment_id,
+            "course_code": assessment.get("course_code"),
+            "type": assessment.get("type"),
+            "title": assessment.get("title") or assessment.get("type"),
+            "due_date": assessment.get("due_date"),
+            "hours": hours,
+        }
+
+    def _unscheduled_summary(self, assessment_id: int, hours_required: float, status: str) -> Dict[str, Any]:
+        return {
+            "assessment_id": assessment_id,
+            "scheduled_hours": 0.0,
+            "unscheduled_hours": hours_required,
+            "status": status,
+        }
+
+    def _final_summary(self, assessment_id: int, hours_required: float, remaining: float) -> Dict[str, Any]:
         scheduled = hours_required - remaining
         return {
             "assessment_id": assessment_id,
@@ -150,25 +252,483 @@ class ScheduleOptimizer:
             "status": "ok" if remaining <= 1e-3 else "incomplete_capacity",
         }
 
+    # Alternative strategies
+
+    def _allocate_edf(self, assessments: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+
+        # Earliest-deadline-first: sweep the open days in order, releasing each assessment
+        # into a heap keyed by deadline when its window opens, and give each day's capacity
+        # to the most urgent released work. Unlike greedy, the result does not depend on
+        # list order. O((D + A) log A + T) for D open days, A assessments and T tasks.
+
+        summaries: List[Dict[str, Any]] = [None] * len(assessments)
+        remaining: Dict[int, float] = {}
+        releases = []
+
+        for idx, a in enumerate(assessments):
+            hours_required = float(a.get("hours_required", 0.0))
+            window = self._window_bounds(a)
+            if window is None:
+                summaries[idx] = self._unscheduled_summary(idx, hours_required, "skipped_missing_date_or_zero_hours")
+            elif window[0] >= window[1]:
+                summaries[idx] = self._unscheduled_summary(idx, hours_required, "no_available_days")
+            else:
+                remaining[idx] = hours_required
+                releases.append((window[0], window[1], idx))
+
+        releases.sort()
+        heap: List[tuple] = []
+        next_release = 0
+
+        for i, d in enumerate(self._open_days):
+            while next_release < len(releases) and releases[next_release][0] <= i:
+                _, hi, idx = releases[next_release]
+                heapq.heappush(heap, (hi, idx))
+                next_release += 1
+
+            # A day with less than half an hour left cannot take another block
+            while heap and d.remaining >= 0.5:
+                hi, idx = heap[0]
+
+                # Window closed, or too little left to round into a block
+                if hi <= i or remaining[idx] < 0.5:
+                    heapq.heappop(heap)
+                    continue
+
+                alloc = self._round_allocation(d.remaining, remaining[idx])
+                d.add_task(self._make_task(assessments[idx], idx, alloc))
+                remaining[idx] -= alloc
+
+        for idx, left in remaining.items():
+            summaries[idx] = self._final_summary(idx, float(assessments[idx].get("hours_required", 0.0)), left)
+
+        return summaries
+
+    def _allocate_min_cost_flow(self, assessments: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+
+        # Global solve in half-hour units: source -> assessment (its required hours),
+        # assessment -> each open day in its window (cost = days from window start, so work
+        # is still front-loaded), day -> sink (its capacity). A min-cost max-flow places as
+        # many hours as any allocation can. Successive shortest paths with Dijkstra:
+        # O(F * E log V) for F half-hour units, E = sum of window lengths, V = A + D.
+
+        summaries: List[Dict[str, Any]] = [None] * len(assessments)
+        graph: List[List[list]] = [[], []]
+        source, sink = 0, 1
+        day_nodes: Dict[int, int] = {}
+        demand_edges = []
+
+        for idx, a in enumerate(assessments):
+            hours_required = float(a.get("hours_required", 0.0))
+            window = self._window_bounds(a)
+            if window is None:
+                summaries[idx] = self._unscheduled_summary(idx, hours_required, "skipped_missing_date_or_zero_hours")
+                continue
+            if window[0] >= window[1]:
+                summaries[idx] = self._unscheduled_summary(idx, hours_required, "no_available_days")
+                continue
+
+            units = int(hours_required * 2)
+            node = len(graph)
+            graph.append([])
+            _add_edge(graph, source, node, units, 0)
+
+            edges = []
+            lo, hi = window
+            for i in range(lo, hi):
+                if i not in day_nodes:
+                    day_nodes[i] = len(graph)
+                    graph.append([])
+                    _add_edge(graph, day_nodes[i], sink, int(self._open_days[i].remaining * 2), 0)
+                edges.append((i, node, len(graph[node])))
+                _add_edge(graph, node, day_nodes[i], units, i - lo)
+            demand_edges.append((idx, hours_required, edges))
+
+        _min_cost_max_flow(graph, source, sink)
+
+        # Flow on an edge is the capacity of its reverse edge
+        placed: Dict[int, List[tuple]] = {}
+        for idx, hours_required, edges in demand_edges:
+            scheduled = 0.0
+            for i, node, k in edges:
+                to, _, _, rev = graph[node][k]
+                units = graph[to][rev][1]
+                if units:
+                    placed.setdefault(i, []).append((idx, units / 2))
+                    scheduled += units / 2
+            summaries[idx] = self._final_summary(idx, hours_required, hours_required - scheduled)
+
+        for i in sorted(placed):
+            for idx, hours in sorted(placed[i]):
+                self._open_days[i].add_task(self._make_task(assessments[idx], idx, hours))
+
+        return summaries
+
+    def generate_raw_schedule(self, assessments: List[Dict[str, Any]]) -> Dict[str, Any]:
+        if self.strategy == "edf":
+            allocation_summaries = self._allocate_edf(assessments)
+        elif self.strategy == "flow":
+            allocation_summaries = self._allocate_min_cost_flow(assessments)
+        else:
+            allocation_summaries = []
+            for idx, a in enumerate(assessments):
+                summary = self._allocate_assessment(a, assessment_id=idx)
+                allocation_summaries.append(summary)
+
+        # Build per-day schedule structure
+        self._day_entries = [self._day_entry(d) for d in self.days]
+
+        # Remember the allocation so replan() can apply later edits incrementally
+        if self.strategy == "greedy":
+            self._plan_keys = [_assessment_key(a) for a in assessments]
+            self._plan_windows = [self._window_bounds(a) for a in assessments]
+            self._plan_summaries = allocation_summaries
+
+        return {
+            "days": list(self._day_entries),
+            "allocations": list(allocation_summaries),
+        }
+
+    def _day_entry(self, d: DaySlot) -> Dict[str, Any]:
+        return {
+            "date": d.date.strftime("%Y-%m-%d"),
+            "weekday": d.weekday,
+            "available_hours": d.capacity,
+            "scheduled_hours": self._round_to_half_hour(d.used_hours),
+            "tasks": list(d.tasks),
+        }
+
+    # Incremental re-planning
+
+    def replan(self, assessments: List[Dict[str, Any]]) -> Dict[str, Any]:
+
+        # Same result as a full rebuild, but only re-allocates what an edit can move.
+        # Assessments are filled in list order, so assessment j only depends on days whose
+        # hours changed for some earlier assessment. Changed assessments are refilled
+        # against the capacity left by earlier ones; later ones are refilled only if their
+        # window overlaps a day whose hours actually moved.
+
+        if self._plan_keys is None:
+            # Nothing to patch (first run, or a strategy without incremental support)
+            if self._day_entries is not None:
+                self.days = self._build_day_slots()
+                self._index_days()
+            return self.generate_raw_schedule(assessments)
+
+        old_keys, old_windows = self._plan_keys, self._plan_windows
+        keys = [_assessment_key(a) for a in assessments]
+        windows = []
+        summaries = self._plan_summaries[:len(assessments)]
+        dirty: List[int] = []  # sorted positions in self._open_days whose hours changed
+        touched = set()
+
+        for j in range(max(len(keys), len(old_keys))):
+            old_window = old_windows[j] if j < len(old_keys) else None
+
+            if j < len(keys) and j < len(old_keys) and keys[j] == old_keys[j]:
+                new_window = old_window
+                windows.append(new_window)
+                if new_window is None:
+                    continue
+                i = bisect_left(dirty, new_window[0])
+                if i == len(dirty) or dirty[i] >= new_window[1]:
+                    continue
+            else:
+                new_window = self._window_bounds(assessments[j]) if j < len(keys) else None
+                if j < len(keys):
+                    windows.append(new_window)
+
+            old_hours = {}
+            if old_window is not None:
+                for i in range(*old_window):
+                    hours = self._open_days[i].release(j)
+                    if hours:
+                        old_hours[i] = hours
+
+            new_hours = {}
+            if j < len(keys):
+                # Hide later assessments' tasks so j sees the capacity a full rebuild would
+                parked = {}
+                if new_window is not None:
+                    for i in range(*new_window):
+                        parked[i] = self._open_days[i].detach_after(j)
+
+                summary = self._allocate_assessment(assessments[j], assessment_id=j)
+                if j < len(summaries):
+                    summaries[j] = summary
+                else:
+                    summaries.append(summary)
+
+                for i, tail in parked.items():
+                    d = self._open_days[i]
+                    hours = d.hours_for(j)
+                    if hours:
+                        new_hours[i] = hours
+                    for t in tail:
+                        d.add_task(t)
+
+            for i in old_hours.keys() | new_hours.keys():
+                touched.add(i)
+                if old_hours.get(i, 0.0) != new_hours.get(i, 0.0):
+                    pos = bisect_left(dirty, i)
+                    if pos == len(dirty) or dirty[pos] != i:
+                        dirty.insert(pos, i)
+
+        for i in touched:
+            d = self._open_days[i]
+            self._day_entries[self._day_index[d.date]] = self._day_entry(d)
+
+        self._plan_keys = keys
+        self._plan_windows = windows
+        self._plan_summaries = summaries
+
+        return {
+            "days": list(self._day_entries),
+            "allocations": list(summaries),
+        }
+
+
+class VectorizedScheduleOptimizer(ScheduleOptimizer):
+
+    # Same allocation rules and output as the greedy ScheduleOptimizer, restructured for
+    # cohort re-planning. The per-assessment work (due date parsing, work windows and
+    # their bounds in the open days) is done for all assessments at once with NumPy;
+    # what is left is the sequential day fill, which runs over plain lists with no
+    # per-assessment NumPy calls. Only the greedy strategy is supported.
+
+    def __init__(
+        self,
+        semester_start: str,
+        semester_end: str,
+        daily_hours: Dict[str, float],
+        work_ahead_days: Dict[str, int],
+        strategy: str = "greedy",
+    ):
+        if strategy != "greedy":
+            raise ValueError(f"VectorizedScheduleOptimizer only supports the greedy strategy, got '{strategy}'")
+        super().__init__(semester_start, semester_end, daily_hours, work_ahead_days)
+
+        self._epoch = np.datetime64(self.semester_start, "D")
+        self._open_offsets = np.array([(d.date - self.semester_start).days for d in self._open_days], dtype=np.int64)
+
+    def _window_slices(self, assessments: List[Dict[str, Any]]) -> tuple:
+        # For every assessment: (lo, hi) into self._open_days, or None when it is skipped
+        # for a missing due date or zero hours. Also returns hours_required per assessment.
+        n = len(assessments)
+        hours = [0.0] * n
+        days_before = np.zeros(n, dtype=np.int64)
+        dated = []  # (index, due date string) of assessments that get a window
+
+        for i, a in enumerate(assessments):
+            hours[i] = float(a.get("hours_required", 0.0))
+            due_date = a.get("due_date")
+            if not due_date or hours[i] <= 0:
+                continue
+            override = a.get("work_ahead_days")
+            atype = (a.get("type") or "unknown").lower()
+            days_before[i] = int(override) if override is not None else self.work_ahead_days.get(atype, 7)
+            dated.append((i, due_date))
+
+        slices: List[Optional[tuple]] = [None] * n
+        if not dated:
+            return slices, hours
+
+        index = np.array([i for i, _ in dated], dtype=np.int64)
+        due = self._parse_due_offsets([d for _, d in dated])
+
+        last = (self.semester_end - self.semester_start).days
+        start = np.maximum(due - days_before[index], 0)
+        end = np.minimum(due, last)
+        lo = np.searchsorted(self._open_offsets, start, side="left")
+        hi = np.searchsorted(self._open_offsets, end, side="right")
+
+        for i, l, h in zip(index.tolist(), lo.tolist(), hi.tolist()):
+            slices[i] = (l, h)
+        return slices, hours
+
+    def _parse_due_offsets(self, due_dates: List[str]) -> np.ndarray:
+        # Day offsets from semester_start. Strings in the two formats the scalar engine
+        # parses go through one NumPy conversion; anything else (or any invalid date)
+        # falls back to strptime so errors match the scalar engine.
+        if all(DUE_DATE_FORMAT.fullmatch(d) for d in due_dates):
+            try:
+                parsed = np.array([d[:10] for d in due_dates], dtype="datetime64[D]")
+                return (parsed - self._epoch).astype(np.int64)
+            except ValueError:
+                pass
+
+        offsets = []
+        for d in due_dates:
+            if "T" in d:
+                due = datetime.strptime(d, "%Y-%m-%dT%H:%M:%S").date()
+            else:
+                due = datetime.strptime(d, "%Y-%m-%d").date()
+            offsets.append((due - self.semester_start).days)
+        return np.array(offsets, dtype=np.int64)
+
     def generate_raw_schedule(self, assessments: List[Dict[str, Any]]) -> Dict[str, Any]:
+        slices, hours = self._window_slices(assessments)
+
+        capacity = [d.capacity for d in self._open_days]
+        used = [0.0] * len(capacity)
+        tasks: List[List[Dict[str, Any]]] = [[] for _ in capacity]
         allocation_summaries = []
 
         for idx, a in enumerate(assessments):
-            summary = self._allocate_assessment(a, assessment_id=idx)
-            allocation_summaries.append(summary)
+            hours_required = hours[idx]
+            window = slices[idx]
+            if window is None:
+                allocation_summaries.append(
+                    self._unscheduled_summary(idx, hours_required, "skipped_missing_date_or_zero_hours")
+                )
+                continue
+            lo, hi = window
+            if hi <= lo:
+                allocation_summaries.append(self._unscheduled_summary(idx, hours_required, "no_available_days"))
+                continue
 
-        # Build per-day schedule structure
+            # Same arithmetic as ScheduleOptimizer._allocate_assessment / _round_allocation
+            remaining = hours_required
+            for i in range(lo, hi):
+                if remaining <= 0.25:
+                    break
+                available = max(capacity[i] - used[i], 0.0)
+                if available < 0.25:
+                    continue
+                alloc = min(available, remaining)
+                rounded = round(alloc * 2) / 2
+                if rounded > available or rounded > remaining:
+                    rounded = round((alloc - 0.25) * 2) / 2
+                if rounded <= 0 or rounded > available:
+                    continue
+                used[i] += rounded
+                tasks[i].append(self._make_task(a, idx, rounded))
+                remaining -= rounded
+
+            allocation_summaries.append(self._final_summary(idx, hours_required, remaining))
+
+        open_position = {offset: i for i, offset in enumerate(self._open_offsets.tolist())}
+        dates = np.datetime_as_string(self._epoch + np.arange(len(self.days))).tolist()
         day_entries = []
-        for d in self.days:
+        for offset, d in enumerate(self.days):
+            i = open_position.get(offset)
             day_entries.append({
-                "date": d.date.strftime("%Y-%m-%d"),
+                "date": dates[offset],
                 "weekday": d.weekday,
                 "available_hours": d.capacity,
-                "scheduled_hours": self._round_to_half_hour(sum(t["hours"] for t in d.tasks)),
-                "tasks": d.tasks,
+                "scheduled_hours": self._round_to_half_hour(used[i]) if i is not None else 0.0,
+                "tasks": tasks[i] if i is not None else [],
             })
 
         return {
             "days": day_entries,
             "allocations": allocation_summaries,
         }
+
+    def replan(self, assessments: List[Dict[str, Any]]) -> Dict[str, Any]:
+        # No incremental state in this engine; every run starts from empty days
+        return self.generate_raw_schedule(assessments)
+
+
+# Min-cost flow helpers (edges are [to, capacity, cost, index of reverse edge])
+
+def _add_edge(graph: List[List[list]], u: int, v: int, capacity: int, cost: int) -> None:
+    graph[u].append([v, capacity, cost, len(graph[v])])
+    graph[v].append([u, 0, -cost, len(graph[u]) - 1])
+
+
+def _min_cost_max_flow(graph: List[List[list]], source: int, sink: int) -> int:
+    # Successive shortest paths; potentials keep reduced costs non-negative for Dijkstra
+    n = len(graph)
+    potential = [0] * n
+    flow = 0
+
+    while True:
+        dist = [float("inf")] * n
+        prev: List[Optional[tuple]] = [None] * n
+        dist[source] = 0
+        heap = [(0, source)]
+        while heap:
+            du, u = heapq.heappop(heap)
+            if du > dist[u]:
+                continue
+            for k, (v, capacity, cost, _) in enumerate(graph[u]):
+                if capacity <= 0:
+                    continue
+                nd = du + cost + potential[u] - potential[v]
+                if nd < dist[v]:
+                    dist[v] = nd
+                    prev[v] = (u, k)
+                    heapq.heappush(heap, (nd, v))
+
+        if dist[sink] == float("inf"):
+            return flow
+
+        for v in range(n):
+            if dist[v] < float("inf"):
+                potential[v] += dist[v]
+
+        push = float("inf")
+        v = sink
+        while v != source:
+            u, k = prev[v]
+            push = min(push, graph[u][k][1])
+            v = u
+
+        v = sink
+        while v != source:
+            u, k = prev[v]
+            edge = graph[u][k]
+            edge[1] -= push
+            graph[v][edge[3]][1] += push
+            v = u
+
+        flow += push
+
+
+# Batch generation
+
+def _generate_job(job: Dict[str, Any], optimizer_cls: Type[ScheduleOptimizer]) -> Dict[str, Any]:
+    # Runs in a worker process; failures are reported per job instead of raised
+    try:
+        optimizer = optimizer_cls(
+            semester_start=job["semester_start"],
+            semester_end=job["semester_end"],
+            daily_hours=job.get("daily_hours") or {},
+            work_ahead_days=job.get("work_ahead_days") or {},
+            **({"strategy": job["strategy"]} if job.get("strategy") else {}),
+        )
+        schedule = optimizer.generate_raw_schedule(job.get("assessments") or [])
+        return {"user_id": job.get("user_id"), "ok": True, "schedule": schedule, "error": None}
+    except Exception as e:
+        return {"user_id": job.get("user_id"), "ok": False, "schedule": None, "error": f"{type(e).__name__}: {e}"}
+
+
+def generate_many(
+    jobs: Iterable[Dict[str, Any]],
+    workers: Optional[int] = None,
+    chunksize: Optional[int] = None,
+    optimizer_cls: Type[ScheduleOptimizer] = ScheduleOptimizer,
+) -> List[Dict[str, Any]]:
+
+    # Each job is one user's plan:
+    #   {"user_id", "semester_start", "semester_end", "daily_hours", "work_ahead_days", "assessments"}
+    # plus an optional "strategy" (see STRATEGIES)
+    # Results come back in job order as {"user_id", "ok", "schedule", "error"}
+
+    jobs = list(jobs)
+    if not jobs:
+        return []
+
+    workers = workers or os.cpu_count() or 1
+    run = partial(_generate_job, optimizer_cls=optimizer_cls)
+
+    if workers == 1:
+        return [run(job) for job in jobs]
+
+    # Several jobs per task keeps pickling overhead low for thousands of small plans
+    if chunksize is None:
+        chunksize = max(1, len(jobs) // (workers * 4))
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(run, jobs, chunksize=chunksize))
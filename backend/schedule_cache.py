@@ -0,0 +1,60 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+
+# Generated schedules keyed by a canonical hash of everything that determines them,
+# so pressing "Generate Study Plan" again with unchanged inputs skips the solve.
+# Least recently used entries are evicted per user (max_per_user) and across the
+# process (max_entries).
+
+
+def schedule_fingerprint(semester_start, semester_end, daily_hours, work_ahead_days, assessments, strategy="greedy"):
+    data = json.dumps(
+        [semester_start, semester_end, daily_hours, work_ahead_days, assessments, strategy],
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+class ScheduleCache:
+
+    def __init__(self, max_entries=512, max_per_user=8):
+        self.max_entries = max_entries
+        self.max_per_user = max_per_user
+        self._entries = OrderedDict()  # (uid, fingerprint) -> schedule, oldest first
+        self._per_user = {}            # uid -> OrderedDict of that user's fingerprints
+        self._lock = threading.Lock()
+
+    def get(self, uid, fingerprint):
+        key = (uid, fingerprint)
+        with self._lock:
+            schedule = self._entries.get(key)
+            if schedule is not None:
+                self._entries.move_to_end(key)
+                self._per_user[uid].move_to_end(fingerprint)
+            return schedule
+
+    def put(self, uid, fingerprint, schedule):
+        key = (uid, fingerprint)
+        with self._lock:
+            self._entries[key] = schedule
+            self._entries.move_to_end(key)
+            mine = self._per_user.setdefault(uid, OrderedDict())
+            mine[fingerprint] = None
+            mine.move_to_end(fingerprint)
+
+            while len(mine) > self.max_per_user:
+                old, _ = mine.popitem(last=False)
+                del self._entries[(uid, old)]
+            while len(self._entries) > self.max_entries:
+                (old_uid, old), _ = self._entries.popitem(last=False)
+                self._per_user[old_uid].pop(old, None)
+                if not self._per_user[old_uid]:
+                    del self._per_user[old_uid]
+
+    def __len__(self):
+        return len(self._entries)
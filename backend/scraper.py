@@ -1,24 +1,222 @@
 import PyPDF2
 import openai
+import io
 import json
+import multiprocessing
+import os
+import queue
+import random
+import threading
+import time
+from collections import namedtuple
+from contextlib import contextmanager
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from backend.json_stream import BreakdownStreamParser
+from backend.relevance import DEFAULT_TOKEN_BUDGET, select_relevant_text
+from backend.rule_parser import parse_grading_table
+from backend.syllabus_cache import cache_key
+
+
+# Errors worth retrying with backoff (rate limits and transient network problems)
+RETRYABLE_ERRORS = (openai.RateLimitError, openai.APITimeoutError, openai.APIConnectionError)
+
+# PDFs with at least this many pages are split across a process pool
+PARALLEL_PAGE_THRESHOLD = 40
+
+# Rule-based results at or above this confidence skip the LLM call
+RULE_CONFIDENCE_THRESHOLD = 0.85
+
+# Part of the parse cache key; bump whenever the prompt or model changes the output
+PROMPT_VERSION = "2025-11-gpt-4.1-v2"
+
+
+# PDF sources: a path, raw bytes (bytes/bytearray/memoryview), or a binary file-like
+# object such as Streamlit's UploadedFile, which is read in place without a temp file
+
+@contextmanager
+def _open_pdf(source):
+    if isinstance(source, (str, Path)):
+        with open(source, 'rb') as file:
+            yield file
+    elif isinstance(source, (bytes, bytearray, memoryview)):
+        yield io.BytesIO(source)
+    else:
+        source.seek(0)
+        yield source
+
+
+def _hash_source(source, key_fn):
+    # Calls key_fn on the PDF's bytes without copying in-memory buffers
+    if isinstance(source, (str, Path)):
+        return key_fn(Path(source).read_bytes())
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return key_fn(source)
+    if hasattr(source, "getbuffer"):
+        with source.getbuffer() as buf:
+            return key_fn(buf)
+    source.seek(0)
+    return key_fn(source.read())
+
+
+# Text of one page and how long extraction took, for spotting pathological documents
+PageText = namedtuple("PageText", ["page", "text", "seconds"])
+
+
+def iter_pdf_pages(source, start=0, stop=None):
+    # Yields a PageText for each page in [start, stop) in order; text is "" for pages
+    # without any
+    with _open_pdf(source) as stream:
+        yield from _iter_reader_pages(PyPDF2.PdfReader(stream), start, stop)
+
+
+def _iter_reader_pages(pdf_reader, start=0, stop=None):
+    stop = len(pdf_reader.pages) if stop is None else stop
+    for i in range(start, stop):
+        t0 = time.perf_counter()
+        text = pdf_reader.pages[i].extract_text() or ""
+        yield PageText(i, text, time.perf_counter() - t0)
+
+
+def _extract_page_range(data, start, stop):
+    # Runs in a worker process, so it gets the raw bytes and parses its own reader
+    return list(iter_pdf_pages(data, start, stop))
+
+
+def _source_bytes(source):
+    if isinstance(source, (str, Path)):
+        return Path(source).read_bytes()
+    if isinstance(source, bytes):
+        return source
+    if isinstance(source, (bytearray, memoryview)):
+        return bytes(source)
+    if hasattr(source, "getvalue"):
+        return source.getvalue()
+    source.seek(0)
+    return source.read()
+
+
+# One process pool for page extraction, shared by every PDF and scrape_many thread so
+# the total number of extraction processes stays at PAGE_POOL_WORKERS. Workers are
+# started from a forkserver (spawn where that is unavailable) rather than forked from
+# this multi-threaded process.
+PAGE_POOL_WORKERS = min(4, os.cpu_count() or 1)
+
+_page_pool = None
+_page_pool_lock = threading.Lock()
+
+
+def _get_page_pool():
+    global _page_pool
+    with _page_pool_lock:
+        if _page_pool is None:
+            method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            _page_pool = ProcessPoolExecutor(
+                max_workers=PAGE_POOL_WORKERS,
+                mp_context=multiprocessing.get_context(method),
+            )
+        return _page_pool
+
+
+def _discard_page_pool(pool):
+    global _page_pool
+    with _page_pool_lock:
+        if _page_pool is pool:
+            _page_pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def extract_pdf_pages(source, workers=None, threshold=PARALLEL_PAGE_THRESHOLD):
+    # Returns a PageText per page, in page order. Small PDFs are extracted here;
+    # large ones are split into page ranges for up to `workers` processes of the
+    # shared page pool, since PyPDF2 extraction is CPU-bound and would otherwise
+    # block the script thread.
+    workers = min(workers or PAGE_POOL_WORKERS, PAGE_POOL_WORKERS)
+
+    # One reader: small PDFs are extracted from it, large ones only need its page count
+    with _open_pdf(source) as stream:
+        pdf_reader = PyPDF2.PdfReader(stream)
+        page_count = len(pdf_reader.pages)
+        if workers == 1 or page_count < threshold:
+            return list(_iter_reader_pages(pdf_reader, 0, page_count))
+
+    data = _source_bytes(source)
+    step = -(-page_count // (workers * 2))
+    ranges = [(start, min(start + step, page_count)) for start in range(0, page_count, step)]
+
+    pool = _get_page_pool()
+    try:
+        futures = [pool.submit(_extract_page_range, data, start, stop) for start, stop in ranges]
+        pages = []
+        for future in futures:
+            pages.extend(future.result())
+        return pages
+    except BrokenProcessPool:
+        # A worker died (e.g. killed for memory); start a fresh pool next time
+        _discard_page_pool(pool)
+        raise
 
 
 class SyllabusScraper:
 
-    def __init__(self, api_key):
-        self.client = openai.OpenAI(api_key=api_key)
+    def __init__(
+        self,
+        api_key,
+        client=None,
+        max_retries=3,
+        backoff=1.0,
+        cache=None,
+        page_workers=None,
+        parallel_page_threshold=PARALLEL_PAGE_THRESHOLD,
+        on_page_timings=None,
+        token_budget=DEFAULT_TOKEN_BUDGET,
+        rule_confidence=RULE_CONFIDENCE_THRESHOLD,
+    ):
+        # client can be any object with the OpenAI chat.completions.create() surface,
+        # e.g. backend.fakes.FakeOpenAIClient in tests
+        # The SDK's own retries are off: _create_completion retries with its own backoff
+        self.client = client or openai.OpenAI(api_key=api_key, max_retries=0)
+        self.max_retries = max_retries
+        self.backoff = backoff
+
+        # Optional parse cache from backend.syllabus_cache (DiskCache or SupabaseCache)
+        self.cache = cache
+
+        # Page-parallel extraction settings; on_page_timings(pages) receives the
+        # PageText list of every extracted PDF
+        self.page_workers = page_workers
+        self.parallel_page_threshold = parallel_page_threshold
+        self.on_page_timings = on_page_timings
+
+        # Syllabus text over this many tokens is cut down to its assessment-related
+        # sections before prompting (None sends the full text)
+        self.token_budget = token_budget
+
+        # Minimum confidence for the local grading-table parser (None always uses the LLM)
+        self.rule_confidence = rule_confidence
+
+    def extract_text_from_pdf(self, source):
+        pages = extract_pdf_pages(source, self.page_workers, self.parallel_page_threshold)
+        if self.on_page_timings:
+            self.on_page_timings(pages)
+        return "".join(p.text for p in pages)
+
+    def parse_syllabus(self, text, semester_start, semester_end, on_assessment=None):
+        # With on_assessment, the completion is streamed and on_assessment(item) is called
+        # for each assessments.breakdown item as soon as it has been received
+
+        # Clean grading tables are parsed locally, skipping the round trip
+        if self.rule_confidence is not None:
+            data, confidence = parse_grading_table(text, semester_start, semester_end)
+            if confidence >= self.rule_confidence and abs(data["assessments"]["total_weight"] - 100) <= 1:
+                _emit_assessments(data, on_assessment)
+                return data
 
-    def extract_text_from_pdf(self, pdf_path):
-        text = ""
-        with open(pdf_path, 'rb') as file:
-            pdf_reader = PyPDF2.PdfReader(file)
-            for page in pdf_reader.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text += page_text
-        return text
+        if self.token_budget:
+            text = select_relevant_text(text, self.token_budget)
 
-    def parse_syllabus(self, text, semester_start, semester_end):
         prompt = f"""
         You are a syllabus parser. Extract information from the syllabus and return STRICT JSON.
 
@@ -163,7 +361,7 @@ class SyllabusScraper:
         {text}
         """
 
-        response = self.client.chat.completions.create(
+        request = dict(
             model="gpt-4.1",
             messages=[
                 {"role": "system", "content": "Extract structured syllabus data and output STRICT JSON only."},
@@ -173,8 +371,93 @@ class SyllabusScraper:
             response_format={"type": "json_object"}
         )
 
-        return json.loads(response.choices[0].message.content)
+        if on_assessment is None:
+            response = self._create_completion(**request)
+            return json.loads(response.choices[0].message.content)
+
+        parser = BreakdownStreamParser()
+        for chunk in self._create_completion(stream=True, **request):
+            if not chunk.choices:
+                continue
+            content = chunk.choices[0].delta.content
+            if content:
+                for item in parser.feed(content):
+                    on_assessment(item)
+        return parser.result()
+
+    def _create_completion(self, **kwargs):
+        # Exponential backoff with jitter on rate limits and transient errors
+        for attempt in range(self.max_retries + 1):
+            try:
+                return self.client.chat.completions.create(**kwargs)
+            except RETRYABLE_ERRORS:
+                if attempt == self.max_retries:
+                    raise
+                time.sleep(self.backoff * (2 ** attempt) * (1 + random.random()))
+
+    def scrape_syllabus(self, source, semester_start, semester_end, on_assessment=None):
+        key = None
+        if self.cache is not None:
+            key = _hash_source(source, lambda data: cache_key(data, semester_start, semester_end, PROMPT_VERSION))
+            cached = self.cache.get(key)
+            if cached is not None:
+                _emit_assessments(cached, on_assessment)
+                return cached
+
+        text = self.extract_text_from_pdf(source)
+        data = self.parse_syllabus(text, semester_start, semester_end, on_assessment)
+
+        if key is not None:
+            self.cache.set(key, data)
+        return data
+
+    def scrape_many(self, files, semester_start, semester_end, max_workers=4, on_progress=None, on_assessment=None):
+        # Parse several syllabi concurrently. files is a list of (name, source), where
+        # source is anything extract_text_from_pdf accepts.
+        # Returns [{"name", "data", "error"}] in input order; one failure does not stop
+        # the rest. Callbacks run on the calling thread, so they can safely drive
+        # Streamlit elements:
+        #   on_progress(done, total, name, error) after each file
+        #   on_assessment(name, item) for each assessment as it streams in
+        results = [{"name": name, "data": None, "error": None} for name, _ in files]
+        if not files:
+            return results
+
+        # Workers report through a queue that this thread drains
+        events = queue.Queue()
+
+        def run(i, source):
+            emit = (lambda item: events.put(("assessment", i, item))) if on_assessment else None
+            try:
+                events.put(("done", i, self.scrape_syllabus(source, semester_start, semester_end, emit)))
+            except Exception as e:
+                events.put(("failed", i, e))
+
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(files)))) as pool:
+            for i, (_, source) in enumerate(files):
+                pool.submit(run, i, source)
+
+            done = 0
+            while done < len(files):
+                kind, i, payload = events.get()
+                if kind == "assessment":
+                    on_assessment(results[i]["name"], payload)
+                    continue
+
+                if kind == "done":
+                    results[i]["data"] = payload
+                else:
+                    results[i]["error"] = payload
+                done += 1
+                if on_progress:
+                    on_progress(done, len(files), results[i]["name"], results[i]["error"])
+
+        return results
+
 
-    def scrape_syllabus(self, pdf_path, semester_start, semester_end):
-        text = self.extract_text_from_pdf(pdf_path)
-        return self.parse_syllabus(text, semester_start, semester_end)
+def _emit_assessments(data, on_assessment):
+    # Results that did not stream (cache hits, rule-based parses) still reach the callback
+    if on_assessment is None:
+        return
+    for item in data.get("assessments", {}).get("breakdown", []):
+        on_assessment(item)
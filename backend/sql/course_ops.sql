@@ -0,0 +1,52 @@
+-- Atomic per-course edits on user_courses.courses_json. Each function is a single
+-- UPDATE that only touches one key, so two sessions editing different courses can no
+-- longer overwrite each other, and the client never downloads the course map first.
+--
+-- Needs the version column from delta_saves.sql. p_version is optional: when given,
+-- the edit only applies if the row is still at that version. Both functions return the
+-- new version, or null if nothing was changed (version mismatch, or no row to remove
+-- from).
+
+create or replace function remove_course(
+    p_user_id uuid,
+    p_course_code text,
+    p_version bigint default null
+) returns bigint
+language plpgsql
+security invoker
+as $$
+declare
+    new_version bigint;
+begin
+    update user_courses
+    set courses_json = coalesce(courses_json, '{}'::jsonb) - p_course_code
+    where user_id = p_user_id
+      and (p_version is null or version = p_version)
+    returning version into new_version;
+    return new_version;
+end;
+$$;
+
+
+create or replace function upsert_course(
+    p_user_id uuid,
+    p_course_code text,
+    p_course jsonb,
+    p_version bigint default null
+) returns bigint
+language plpgsql
+security invoker
+as $$
+declare
+    new_version bigint;
+begin
+    insert into user_courses (user_id, courses_json)
+    values (p_user_id, jsonb_build_object(p_course_code, p_course))
+    on conflict (user_id) do update
+    set courses_json = coalesce(user_courses.courses_json, '{}'::jsonb)
+                       || jsonb_build_object(p_course_code, p_course)
+    where p_version is null or user_courses.version = p_version
+    returning version into new_version;
+    return new_version;
+end;
+$$;
@@ -0,0 +1,90 @@
+-- Versioned rows and patch-based saves for the user_* JSON tables.
+--
+-- Every update bumps user_*.version, whoever makes it. backend/sb_functions remembers
+-- the document and version it last read or wrote and sends patch_user_json() only the
+-- changed paths (see backend/json_patch.py). A version mismatch returns null and the
+-- client falls back to a full upsert.
+
+create or replace function bump_version() returns trigger
+language plpgsql
+as $$
+begin
+    new.version := old.version + 1;
+    return new;
+end;
+$$;
+
+alter table user_courses add column if not exists version bigint not null default 0;
+alter table user_settings add column if not exists version bigint not null default 0;
+alter table user_schedule add column if not exists version bigint not null default 0;
+alter table user_task_completion add column if not exists version bigint not null default 0;
+
+drop trigger if exists user_courses_version on user_courses;
+create trigger user_courses_version before update on user_courses
+    for each row execute function bump_version();
+
+drop trigger if exists user_settings_version on user_settings;
+create trigger user_settings_version before update on user_settings
+    for each row execute function bump_version();
+
+drop trigger if exists user_schedule_version on user_schedule;
+create trigger user_schedule_version before update on user_schedule
+    for each row execute function bump_version();
+
+drop trigger if exists user_task_completion_version on user_task_completion;
+create trigger user_task_completion_version before update on user_task_completion
+    for each row execute function bump_version();
+
+
+-- p_set:   [[path, value], ...]   applied with jsonb_set
+-- p_unset: [path, ...]            applied with #-
+-- Returns the new version, or null if the row is missing or not at p_version.
+create or replace function patch_user_json(
+    p_table text,
+    p_user_id uuid,
+    p_version bigint,
+    p_set jsonb,
+    p_unset jsonb
+) returns bigint
+language plpgsql
+security invoker
+as $$
+declare
+    col text;
+    doc jsonb;
+    op jsonb;
+    matched integer;
+    new_version bigint;
+begin
+    col := case p_table
+        when 'user_courses' then 'courses_json'
+        when 'user_settings' then 'settings_json'
+        when 'user_schedule' then 'schedule_json'
+        when 'user_task_completion' then 'completion_json'
+    end;
+    if col is null then
+        raise exception 'patch_user_json: unknown table %', p_table;
+    end if;
+
+    execute format('select %I from %I where user_id = $1 and version = $2 for update', col, p_table)
+        into doc
+        using p_user_id, p_version;
+    get diagnostics matched = row_count;
+    if matched = 0 then
+        return null;
+    end if;
+
+    doc := coalesce(doc, '{}'::jsonb);
+    for op in select * from jsonb_array_elements(coalesce(p_unset, '[]'::jsonb)) loop
+        doc := doc #- array(select jsonb_array_elements_text(op));
+    end loop;
+    for op in select * from jsonb_array_elements(coalesce(p_set, '[]'::jsonb)) loop
+        doc := jsonb_set(doc, array(select jsonb_array_elements_text(op -> 0)), op -> 1, true);
+    end loop;
+
+    execute format('update %I set %I = $1 where user_id = $2 returning version', p_table, col)
+        into new_version
+        using doc, p_user_id;
+    return new_version;
+end;
+$$;
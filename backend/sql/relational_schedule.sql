@@ -0,0 +1,111 @@
+-- Row-per-day storage for schedules and completions, used by backend/sb_functions when
+-- SCHEDULE_STORAGE=rows. Everything is keyed by (user_id, date), so a week is a range
+-- scan and server-side jobs can query across users, e.g. tasks due this week:
+--
+--   select user_id, course_code, title, due_date from schedule_tasks
+--   where due_date >= '2025-10-06' and due_date < '2025-10-13';
+--
+-- due_date keeps the ISO string the planner produces ("YYYY-MM-DD" or
+-- "YYYY-MM-DDTHH:MM:SS"), which sorts and range-compares correctly as text.
+
+create table if not exists schedule_days (
+    user_id uuid not null references auth.users on delete cascade,
+    date date not null,
+    weekday text not null,
+    available_hours numeric not null,
+    scheduled_hours numeric not null,
+    primary key (user_id, date)
+);
+
+create table if not exists schedule_tasks (
+    user_id uuid not null references auth.users on delete cascade,
+    date date not null,
+    position integer not null,  -- order within the day
+    assessment_id integer not null,
+    course_code text,
+    type text,
+    title text,
+    due_date text,
+    hours numeric not null,
+    primary key (user_id, date, position)
+);
+create index if not exists schedule_tasks_due_date on schedule_tasks (due_date);
+
+create table if not exists schedule_allocations (
+    user_id uuid not null references auth.users on delete cascade,
+    assessment_id integer not null,
+    scheduled_hours numeric not null,
+    unscheduled_hours numeric not null,
+    status text not null,
+    primary key (user_id, assessment_id)
+);
+
+create table if not exists task_completions (
+    user_id uuid not null references auth.users on delete cascade,
+    date date not null,
+    task_id text not null,
+    primary key (user_id, date, task_id)
+);
+
+alter table schedule_days enable row level security;
+alter table schedule_tasks enable row level security;
+alter table schedule_allocations enable row level security;
+alter table task_completions enable row level security;
+
+create policy "own rows" on schedule_days for all using (auth.uid() = user_id) with check (auth.uid() = user_id);
+create policy "own rows" on schedule_tasks for all using (auth.uid() = user_id) with check (auth.uid() = user_id);
+create policy "own rows" on schedule_allocations for all using (auth.uid() = user_id) with check (auth.uid() = user_id);
+create policy "own rows" on task_completions for all using (auth.uid() = user_id) with check (auth.uid() = user_id);
+
+
+-- Replaces a user's whole schedule in one transaction
+create or replace function save_schedule_rows(
+    p_user_id uuid,
+    p_days jsonb,
+    p_tasks jsonb,
+    p_allocations jsonb
+) returns void
+language plpgsql
+security invoker
+as $$
+begin
+    delete from schedule_tasks where user_id = p_user_id;
+    delete from schedule_days where user_id = p_user_id;
+    delete from schedule_allocations where user_id = p_user_id;
+
+    insert into schedule_days (user_id, date, weekday, available_hours, scheduled_hours)
+    select p_user_id, d.date, d.weekday, d.available_hours, d.scheduled_hours
+    from jsonb_to_recordset(p_days) as d(
+        date date, weekday text, available_hours numeric, scheduled_hours numeric
+    );
+
+    insert into schedule_tasks (user_id, date, position, assessment_id, course_code, type, title, due_date, hours)
+    select p_user_id, t.date, t.position, t.assessment_id, t.course_code, t.type, t.title, t.due_date, t.hours
+    from jsonb_to_recordset(p_tasks) as t(
+        date date, position integer, assessment_id integer, course_code text,
+        type text, title text, due_date text, hours numeric
+    );
+
+    insert into schedule_allocations (user_id, assessment_id, scheduled_hours, unscheduled_hours, status)
+    select p_user_id, a.assessment_id, a.scheduled_hours, a.unscheduled_hours, a.status
+    from jsonb_to_recordset(p_allocations) as a(
+        assessment_id integer, scheduled_hours numeric, unscheduled_hours numeric, status text
+    );
+end;
+$$;
+
+
+-- Replaces a user's completions in one transaction
+create or replace function save_completion_rows(p_user_id uuid, p_rows jsonb) returns void
+language plpgsql
+security invoker
+as $$
+begin
+    delete from task_completions where user_id = p_user_id;
+
+    insert into task_completions (user_id, date, task_id)
+    select p_user_id, c.date, c.task_id
+    from jsonb_to_recordset(p_rows) as c(date date, task_id text)
+    on conflict do nothing;
+end;
+$$;
@@ -1,7 +1,79 @@
-from supabase import create_client
+import os
+import threading
+
+import httpx
 import streamlit as st
+from supabase import ClientOptions, create_client
+
+
+# One Supabase client per process, built on first use rather than at import, so
+# backend.sb_functions can be imported without secrets. All sessions share its pooled
+# keep-alive HTTP connections. Optional secrets tune it:
+#
+#   SUPABASE_TIMEOUT          request timeout in seconds (default 10)
+#   SUPABASE_RETRIES          retries of failed connection attempts (default 2)
+#   SUPABASE_MAX_CONNECTIONS  size of the connection pool (default 50)
+#
+# use_client() swaps in another client (e.g. backend.fakes.FakeSupabaseClient) for
+# tests and benchmarks; SUPABASE_IN_MEMORY=1 does the same from the environment.
+
+DEFAULT_TIMEOUT = 10.0
+DEFAULT_RETRIES = 2
+DEFAULT_MAX_CONNECTIONS = 50
+
+_override = None
+_override_lock = threading.Lock()
+
+
+def use_client(client):
+    # Pass None to go back to the real client
+    global _override
+    with _override_lock:
+        _override = client
+
+
+def get_client():
+    if _override is not None:
+        return _override
+    if os.environ.get("SUPABASE_IN_MEMORY") == "1":
+        return _in_memory_client()
+    return _managed_client()
+
+
+@st.cache_resource
+def _in_memory_client():
+    from backend.fakes import FakeSupabaseClient
+    return FakeSupabaseClient(versioned=True)
+
+
+@st.cache_resource
+def _managed_client():
+    timeout = float(st.secrets.get("SUPABASE_TIMEOUT", DEFAULT_TIMEOUT))
+    retries = int(st.secrets.get("SUPABASE_RETRIES", DEFAULT_RETRIES))
+    max_connections = int(st.secrets.get("SUPABASE_MAX_CONNECTIONS", DEFAULT_MAX_CONNECTIONS))
+
+    # Transport-level retries only repeat failed connects, which is safe for writes too
+    http = httpx.Client(
+        transport=httpx.HTTPTransport(
+            retries=retries,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+                keepalive_expiry=30.0,
+            ),
+        ),
+        timeout=httpx.Timeout(timeout, connect=min(timeout, 5.0)),
+    )
+
+    try:
+        options = ClientOptions(postgrest_client_timeout=timeout, httpx_client=http)
+    except TypeError:
+        # supabase-py releases without httpx_client still get the timeout
+        http.close()
+        options = ClientOptions(postgrest_client_timeout=timeout)
 
-supabase = create_client(
-    st.secrets["SUPABASE_URL"],
-    st.secrets["SUPABASE_ANON_KEY"]
-)
\ No newline at end of file
+    return create_client(
+        st.secrets["SUPABASE_URL"],
+        st.secrets["SUPABASE_ANON_KEY"],
+        options=options,
+    )
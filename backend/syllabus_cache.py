@@ -0,0 +1,126 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+
+# Cache of parsed syllabi keyed by the PDF contents plus everything else that changes
+# the parse result. The same outline uploaded by many students is parsed once.
+#
+# Backends implement get(key) -> dict | None and set(key, data).
+
+
+def cache_key(pdf_bytes, semester_start, semester_end, prompt_version):
+    h = hashlib.sha256()
+    h.update(pdf_bytes)
+    for part in (semester_start, semester_end, prompt_version):
+        h.update(b"\0")
+        h.update(str(part).encode("utf-8"))
+    return h.hexdigest()
+
+
+class DiskCache:
+
+    # One JSON file per entry. Hits refresh the file's mtime, and the least recently
+    # used files are evicted once there are more than max_entries.
+
+    def __init__(self, directory, max_entries=500, ttl=None):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.ttl = ttl  # seconds, or None to keep entries until evicted
+        self._lock = threading.Lock()
+
+    def _path(self, key):
+        return self.directory / f"{key}.json"
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with path.open("r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if self.ttl is not None and time.time() - entry.get("created", 0) > self.ttl:
+            path.unlink(missing_ok=True)
+            return None
+
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return entry.get("data")
+
+    def set(self, key, data):
+        entry = {"created": time.time(), "data": data}
+
+        # Write to a temp file and rename so readers never see a partial entry
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entry, f)
+            os.replace(tmp, self._path(key))
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+
+        self._evict()
+
+    def _evict(self):
+        with self._lock:
+            entries = []
+            for path in self.directory.glob("*.json"):
+                try:
+                    entries.append((path.stat().st_mtime, path))
+                except OSError:
+                    continue
+            if len(entries) <= self.max_entries:
+                return
+            entries.sort()
+            for _, path in entries[:len(entries) - self.max_entries]:
+                path.unlink(missing_ok=True)
+
+
+class SupabaseCache:
+
+    # Shared across app instances through a Supabase table:
+    #
+    #   create table syllabus_cache (
+    #       key text primary key,
+    #       data jsonb not null,
+    #       created_at timestamptz not null default now()
+    #   );
+
+    def __init__(self, client, table="syllabus_cache", ttl=None):
+        self.client = client
+        self.table = table
+        self.ttl = ttl
+
+    def get(self, key):
+        res = self.client.table(self.table) \
+            .select("data, created_at") \
+            .eq("key", key) \
+            .execute()
+        if not res.data:
+            return None
+
+        row = res.data[0]
+        if self.ttl is not None:
+            created = datetime.fromisoformat(row["created_at"].replace("Z", "+00:00"))
+            if (datetime.now(timezone.utc) - created).total_seconds() > self.ttl:
+                return None
+        return row.get("data")
+
+    def set(self, key, data):
+        self.client.table(self.table).upsert(
+            {
+                "key": key,
+                "data": data,
+                "created_at": datetime.now(timezone.utc).isoformat(),
+            }
+        ).execute()
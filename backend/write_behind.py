@@ -0,0 +1,196 @@
+import atexit
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import streamlit as st
+
+from backend.sb_functions import save_completions, save_courses, save_settings
+
+
+class WriteBehindBuffer:
+
+    # Coalescing write-behind queue for the whole-blob save_* functions. submit() only
+    # records the latest payload for (uid, table) and returns; a background thread
+    # writes it once it has been left alone for `delay` seconds, so a burst of checkbox
+    # toggles becomes one upsert. Failed writes stay queued and are retried with
+    # exponential backoff. With spool_dir set, every pending payload is also kept on
+    # disk until it has been written, so a restart replays it instead of losing it.
+    #
+    # writers maps a table name to fn(uid, payload).
+
+    def __init__(self, writers, delay=1.5, backoff=1.0, max_backoff=60.0, spool_dir=None):
+        self.writers = writers
+        self.delay = delay
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.spool_dir = Path(spool_dir) if spool_dir else None
+        self.errors = {}  # (uid, table) -> last exception, cleared on the next success
+
+        self._pending = {}  # (uid, table) -> {"payload", "due", "attempts"}
+        self._in_flight = None
+        self._flushing = []  # uid filters of flush() calls in progress (None = everyone)
+        self._closed = False
+        self._cond = threading.Condition()
+
+        if self.spool_dir:
+            self.spool_dir.mkdir(parents=True, exist_ok=True)
+            self._load_spool()
+
+        self._thread = threading.Thread(target=self._run, name="write-behind", daemon=True)
+        self._thread.start()
+
+    def submit(self, uid, table, payload):
+        if table not in self.writers:
+            raise ValueError(f"No writer for table {table!r}")
+
+        # Snapshot now: the caller keeps mutating the dict in session_state
+        payload = json.loads(json.dumps(payload))
+        key = (uid, table)
+
+        with self._cond:
+            # A flush in progress for this user takes the new payload along too
+            due = time.monotonic() + (0.0 if self._is_flushing(key) else self.delay)
+            self._pending[key] = {"payload": payload, "due": due, "attempts": 0}
+            self._spool(key, payload)
+            self._cond.notify_all()
+
+    def flush(self, uid=None, timeout=10.0):
+        # Writes everything pending for uid (or for everyone) now and waits for it,
+        # retrying failed writes every `backoff` seconds until timeout. Returns False if
+        # something could not be written; it stays queued for retry.
+        deadline = time.monotonic() + timeout
+
+        def matches(key):
+            return key is not None and (uid is None or key[0] == uid)
+
+        with self._cond:
+            self._flushing.append(uid)
+            try:
+                now = time.monotonic()
+                for key, entry in self._pending.items():
+                    if matches(key):
+                        entry["due"] = now
+                self._cond.notify_all()
+
+                while matches(self._in_flight) or any(matches(key) for key in self._pending):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+
+                return not (matches(self._in_flight) or any(matches(key) for key in self._pending))
+            finally:
+                self._flushing.remove(uid)
+
+    def run_after_flush(self, uid, action, timeout=10.0):
+        # Calls action() once everything queued for uid has been written, for edits made
+        # outside the buffer (e.g. the per-course RPCs) that an older queued payload would
+        # undo when it lands. Returns False without calling action if the queue could not
+        # be written out in time.
+        if not self.flush(uid, timeout):
+            return False
+        action()
+        return True
+
+    def _is_flushing(self, key):
+        return any(uid is None or uid == key[0] for uid in self._flushing)
+
+    def close(self, timeout=10.0):
+        self.flush(timeout=timeout)
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join(timeout=1.0)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while True:
+                    if self._closed:
+                        return
+                    now = time.monotonic()
+                    key = min(self._pending, key=lambda k: self._pending[k]["due"], default=None)
+                    if key is not None and self._pending[key]["due"] <= now:
+                        break
+                    self._cond.wait(None if key is None else self._pending[key]["due"] - now)
+
+                entry = self._pending.pop(key)
+                self._in_flight = key
+
+            uid, table = key
+            try:
+                self.writers[table](uid, entry["payload"])
+                error = None
+            except Exception as e:
+                error = e
+
+            with self._cond:
+                self._in_flight = None
+                if error is None:
+                    self.errors.pop(key, None)
+                    # A newer payload submitted meanwhile owns the spool file now
+                    if key not in self._pending:
+                        self._unspool(key)
+                else:
+                    self.errors[key] = error
+                    if key not in self._pending:
+                        entry["attempts"] += 1
+                        wait = min(self.max_backoff, self.backoff * 2 ** (entry["attempts"] - 1))
+                        if self._is_flushing(key):
+                            # Someone is waiting on this write: keep retrying at the base rate
+                            wait = min(wait, self.backoff)
+                        entry["due"] = time.monotonic() + wait
+                        self._pending[key] = entry
+                self._cond.notify_all()
+
+    def _spool_path(self, key):
+        name = hashlib.sha1(json.dumps(key).encode("utf-8")).hexdigest()
+        return self.spool_dir / f"{name}.json"
+
+    def _spool(self, key, payload):
+        if not self.spool_dir:
+            return
+        fd, tmp = tempfile.mkstemp(dir=self.spool_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"uid": key[0], "table": key[1], "payload": payload}, f)
+            os.replace(tmp, self._spool_path(key))
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+
+    def _unspool(self, key):
+        if self.spool_dir:
+            self._spool_path(key).unlink(missing_ok=True)
+
+    def _load_spool(self):
+        now = time.monotonic()
+        for path in self.spool_dir.glob("*.json"):
+            try:
+                with path.open("r", encoding="utf-8") as f:
+                    entry = json.load(f)
+            except (OSError, ValueError):
+                continue
+            if entry.get("table") in self.writers:
+                key = (entry["uid"], entry["table"])
+                self._pending[key] = {"payload": entry["payload"], "due": now, "attempts": 0}
+
+
+# One buffer per process, shared by every session and page
+@st.cache_resource
+def get_write_buffer():
+    buffer = WriteBehindBuffer(
+        {
+            "courses": save_courses,
+            "settings": save_settings,
+            "completions": save_completions,
+        },
+        spool_dir=Path(".cache") / "write_behind",
+    )
+    atexit.register(buffer.close)
+    return buffer
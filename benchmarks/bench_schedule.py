@@ -0,0 +1,149 @@
+import argparse
+import copy
+import json
+import platform
+import statistics
+import subprocess
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+from backend.schedule import STRATEGIES, ScheduleOptimizer, VectorizedScheduleOptimizer
+from benchmarks.generators import make_plan
+
+
+# Times the scheduler on seeded synthetic plans and writes JSON that can be diffed
+# between commits:
+#
+#   python -m benchmarks.bench_schedule
+#   python -m benchmarks.bench_schedule --compare benchmarks/results/<old>.json
+
+COURSE_COUNTS = [1, 5, 10, 25, 50]
+TERM_COUNTS = [1, 3, 12]  # one term, one year, four years
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+
+def _time(fn: Callable[[], Any], repeat: int) -> Dict[str, float]:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return {"best_s": min(samples), "median_s": statistics.median(samples)}
+
+
+def _optimizer(plan: Dict[str, Any], cls=ScheduleOptimizer, **kwargs) -> ScheduleOptimizer:
+    return cls(
+        semester_start=plan["semester_start"],
+        semester_end=plan["semester_end"],
+        daily_hours=plan["daily_hours"],
+        work_ahead_days=plan["work_ahead_days"],
+        **kwargs,
+    )
+
+
+def bench_plan(plan: Dict[str, Any], strategies: List[str], repeat: int) -> Dict[str, Dict[str, float]]:
+    assessments = plan["assessments"]
+    timings = {}
+
+    optimizer = _optimizer(plan)
+    timings["build_day_slots"] = _time(optimizer._build_day_slots, repeat)
+
+    for strategy in strategies:
+        timings[f"generate_raw_schedule[{strategy}]"] = _time(
+            lambda: _optimizer(plan, strategy=strategy).generate_raw_schedule(assessments), repeat
+        )
+
+    timings["generate_raw_schedule[vectorized]"] = _time(
+        lambda: _optimizer(plan, VectorizedScheduleOptimizer).generate_raw_schedule(assessments), repeat
+    )
+
+    # One edited row in the middle of the list, as on the Optimize page
+    if assessments:
+        edited = copy.deepcopy(assessments)
+        edited[len(edited) // 2]["hours_required"] += 2
+
+        def replan():
+            optimizer = _optimizer(plan)
+            optimizer.generate_raw_schedule(assessments)
+            start = time.perf_counter()
+            optimizer.replan(edited)
+            return time.perf_counter() - start
+
+        samples = [replan() for _ in range(repeat)]
+        timings["replan[single_edit]"] = {"best_s": min(samples), "median_s": statistics.median(samples)}
+
+    return timings
+
+
+def _git_commit() -> str:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True)
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def run(courses: List[int], terms: List[int], strategies: List[str], repeat: int, seed: int) -> Dict[str, Any]:
+    results = []
+    for n_terms in terms:
+        for n_courses in courses:
+            plan = make_plan(seed, n_courses, n_terms)
+            case = f"courses={n_courses},terms={n_terms}"
+            print(f"{case} ({len(plan['assessments'])} assessments)")
+            for op, timing in bench_plan(plan, strategies, repeat).items():
+                print(f"  {op:<40} {timing['best_s'] * 1000:10.2f} ms")
+                results.append({
+                    "case": case,
+                    "courses": n_courses,
+                    "terms": n_terms,
+                    "assessments": len(plan["assessments"]),
+                    "op": op,
+                    **timing,
+                })
+
+    return {
+        "commit": _git_commit(),
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "seed": seed,
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def compare(old: Dict[str, Any], new: Dict[str, Any]) -> None:
+    before = {(r["case"], r["op"]): r["best_s"] for r in old["results"]}
+    print(f"\n{old['commit']} -> {new['commit']} (best time, ratio > 1 is slower)")
+    for r in new["results"]:
+        key = (r["case"], r["op"])
+        if key in before and before[key] > 0:
+            print(f"  {r['case']:<22} {r['op']:<40} {r['best_s'] / before[key]:6.2f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark ScheduleOptimizer on synthetic semesters")
+    parser.add_argument("--courses", type=int, nargs="+", default=COURSE_COUNTS)
+    parser.add_argument("--terms", type=int, nargs="+", default=TERM_COUNTS)
+    parser.add_argument("--strategies", nargs="+", choices=STRATEGIES, default=list(STRATEGIES))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", type=Path, help="JSON output path (default: benchmarks/results/<commit>.json)")
+    parser.add_argument("--compare", type=Path, help="Earlier results JSON to compare against")
+    args = parser.parse_args()
+
+    report = run(args.courses, args.terms, args.strategies, args.repeat, args.seed)
+
+    out = args.out or RESULTS_DIR / f"{report['commit']}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(report, indent=2))
+    print(f"\nWrote {out}")
+
+    if args.compare:
+        compare(json.loads(args.compare.read_text()), report)
+
+
+if __name__ == "__main__":
+    main()
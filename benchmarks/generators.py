@@ -0,0 +1,106 @@
+import random
+from datetime import date, timedelta
+from typing import Any, Dict, List
+
+from backend.schedule import DAY_NAMES
+
+
+# Seeded synthetic inputs for the scheduler benchmarks. Same seed -> same semester,
+# so results can be compared between commits.
+
+TERM_DAYS = 112  # 16 weeks
+
+# Mirrors the defaults offered on the Settings page
+BASE_HOURS = {
+    "assignment": 4, "quiz": 3, "lab": 3, "midterm": 12,
+    "final": 20, "project": 25, "presentation": 10, "essay": 20,
+}
+WORK_AHEAD_DAYS = {
+    "assignment": 7, "quiz": 3, "lab": 1, "midterm": 10,
+    "final": 20, "project": 20, "presentation": 7, "essay": 20,
+}
+
+# Items per course per term, as (type, min count, max count)
+COURSE_TEMPLATE = [
+    ("assignment", 2, 6),
+    ("quiz", 0, 5),
+    ("lab", 0, 8),
+    ("midterm", 1, 2),
+    ("final", 1, 1),
+    ("project", 0, 1),
+    ("presentation", 0, 1),
+    ("essay", 0, 1),
+]
+
+DAILY_HOURS_PROFILES = {
+    "light": (0.5, 2.0),
+    "weekday": (2.0, 4.0),
+    "heavy": (4.0, 8.0),
+}
+
+
+def make_daily_hours(rng: random.Random, profile: str = "weekday") -> Dict[str, float]:
+    low, high = DAILY_HOURS_PROFILES[profile]
+    hours = {}
+    for i, day in enumerate(DAY_NAMES):
+        # Weekends are lighter and sometimes off entirely
+        if i >= 5 and rng.random() < 0.4:
+            hours[day] = 0.0
+        else:
+            hours[day] = round(rng.uniform(low, high) * 2) / 2
+    return hours
+
+
+def make_course_assessments(
+    rng: random.Random,
+    course_code: str,
+    term_start: date,
+    term_days: int = TERM_DAYS,
+) -> List[Dict[str, Any]]:
+    assessments = []
+    for atype, low, high in COURSE_TEMPLATE:
+        for n in range(rng.randint(low, high)):
+            if atype == "final":
+                due = term_start + timedelta(days=term_days - rng.randint(1, 10))
+            else:
+                due = term_start + timedelta(days=rng.randint(14, term_days - 14))
+            due_str = due.isoformat()
+            if rng.random() < 0.5:
+                due_str += "T23:59:00"
+            assessments.append({
+                "course_code": course_code,
+                "type": atype,
+                "title": f"{atype.title()} {n + 1}",
+                "due_date": due_str,
+                "hours_required": BASE_HOURS[atype],
+                "work_ahead_days": WORK_AHEAD_DAYS[atype],
+            })
+    return assessments
+
+
+def make_plan(
+    seed: int,
+    n_courses: int,
+    n_terms: int = 1,
+    profile: str = "weekday",
+    start: date = date(2025, 9, 2),
+) -> Dict[str, Any]:
+    # One user's plan in the same shape generate_many() takes as a job
+    rng = random.Random(f"{seed}-{n_courses}-{n_terms}-{profile}")
+    assessments = []
+    for term in range(n_terms):
+        term_start = start + timedelta(days=term * TERM_DAYS)
+        for c in range(n_courses):
+            code = f"CP{100 + c:03d}-T{term + 1}"
+            assessments.extend(make_course_assessments(rng, code, term_start))
+
+    # The optimizer allocates in list order, and the page lists assessments by course
+    end = start + timedelta(days=n_terms * TERM_DAYS - 1)
+    return {
+        "user_id": f"bench-{seed}",
+        "semester_start": start.isoformat(),
+        "semester_end": end.isoformat(),
+        "daily_hours": make_daily_hours(rng, profile),
+        "work_ahead_days": dict(WORK_AHEAD_DAYS),
+        "assessments": assessments,
+    }
@@ -2,7 +2,8 @@ import streamlit as st
 from pathlib import Path
 from datetime import datetime
 from backend.scraper import SyllabusScraper
-from backend.sb_functions import save_courses, save_settings
+from backend.syllabus_cache import DiskCache
+from backend.write_behind import get_write_buffer
 
 # Stop if user not logged in
 
@@ -21,8 +22,12 @@ API_KEY = (
     else None
 )
 
-# Create uploads directory if it doesn't exist
-Path("uploads").mkdir(exist_ok=True)
+
+# Parsed syllabi are shared by every session in this process
+@st.cache_resource
+def get_syllabus_cache():
+    return DiskCache(Path(".cache") / "syllabi", max_entries=2000, ttl=120 * 24 * 3600)
+
 
 st.subheader("Semester Settings")
 
@@ -93,7 +98,7 @@ if st.button("Save Semester Dates", use_container_width=True):
         st.session_state["settings"]["semester_end"] = semester_end
 
         if "uid" in st.session_state:
-            save_settings(st.session_state["uid"], st.session_state["settings"])
+            get_write_buffer().submit(st.session_state["uid"], "settings", st.session_state["settings"])
             st.success("Semester dates saved!")
         else:
             st.error("Please log in to save dates")
@@ -142,36 +147,58 @@ if uploads and st.button("Parse All Syllabi", use_container_width=True):
         st.stop()
 
     # Initialize scraper
-    scraper = SyllabusScraper(API_KEY)
+    scraper = SyllabusScraper(API_KEY, cache=get_syllabus_cache())
 
     # Process PDFs
     parsed_courses = st.session_state.get("courses", {}).copy()
     progress = st.progress(0)
-
-    for i, up in enumerate(uploads, start=1):
-        # Save uploaded file temporarily
-        tmp_path = Path("uploads") / up.name
-        with tmp_path.open("wb") as f:
-            f.write(up.getbuffer())
-
-        # Parse syllabus
-        with st.spinner(f"Parsing {up.name}..."):
-            data = scraper.scrape_syllabus(
-                pdf_path=str(tmp_path),
-                semester_start=saved_start,
-                semester_end=saved_end
-            )
+    status = st.empty()
+    live = st.container()
+
+    # Uploaded files are parsed in memory, straight from their buffers
+    files = [(up.name, up) for up in uploads]
+
+    def on_progress(done, total, name, error):
+        progress.progress(done / total)
+        status.write(f"Parsed {done} of {total} ({name})")
+
+    # Show assessments as they stream in
+    def on_assessment(name, item):
+        weight = item.get("weight")
+        due = item.get("due_date") or "no due date"
+        live.write(f"**{name}**: {item.get('type', 'Assessment')} ({weight}%) - {due}")
+
+    # Parse syllabi concurrently
+    with st.spinner(f"Parsing {len(files)} syllabi..."):
+        results = scraper.scrape_many(
+            files,
+            semester_start=saved_start,
+            semester_end=saved_end,
+            on_progress=on_progress,
+            on_assessment=on_assessment
+        )
+
+    failed = []
+    for result in results:
+        if result["error"] is not None:
+            failed.append(result)
+            continue
 
         # Use course code if detected, otherwise filename
-        course_code = data.get("course_info", {}).get("course_code", up.name)
+        data = result["data"]
+        course_code = data.get("course_info", {}).get("course_code", result["name"])
         parsed_courses[course_code] = data
 
-        progress.progress(i / len(uploads))
+    for result in failed:
+        st.error(f"Could not parse {result['name']}: {result['error']}")
 
     # Save parsed courses
     st.session_state["courses"] = parsed_courses
 
     if "uid" in st.session_state:
-        save_courses(st.session_state["uid"], parsed_courses)
+        get_write_buffer().submit(st.session_state["uid"], "courses", parsed_courses)
 
-    st.success("All syllabi parsed and saved!")
+    if failed:
+        st.warning(f"Parsed and saved {len(results) - len(failed)} of {len(results)} syllabi.")
+    else:
+        st.success("All syllabi parsed and saved!")
@@ -1,6 +1,6 @@
 import streamlit as st
 from utils.normalize import normalize_type
-from backend.sb_functions import save_settings
+from backend.write_behind import get_write_buffer
 
 # Stop if user not logged in
 
@@ -160,7 +160,7 @@ if st.button("Save Settings"):
     }
 
     if "uid" in st.session_state:
-        save_settings(st.session_state["uid"], st.session_state["settings"])
+        get_write_buffer().submit(st.session_state["uid"], "settings", st.session_state["settings"])
 
     # Clear cached assessments to trigger recalculation with new defaults
     if "edited_assessments" in st.session_state:
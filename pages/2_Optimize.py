@@ -1,8 +1,11 @@
 import streamlit as st
 import pandas as pd
+import json
 from backend.schedule import ScheduleOptimizer
+from backend.schedule_cache import ScheduleCache, schedule_fingerprint
 from utils.normalize import normalize_type
-from backend.sb_functions import save_schedule, remove_course, save_courses
+from backend.sb_functions import save_schedule, remove_course, upsert_course
+from backend.write_behind import get_write_buffer
 
 # Stop if user not logged in
 
@@ -13,6 +16,12 @@ if "uid" not in st.session_state or not st.session_state["uid"]:
 st.set_page_config(layout="wide")
 st.title("Optimize Study Plan")
 
+# Generated schedules are shared by every session in this process
+@st.cache_resource
+def get_schedule_cache():
+    return ScheduleCache(max_entries=512, max_per_user=8)
+
+
 # Validate required data exists
 if "courses" not in st.session_state or not st.session_state["courses"]:
     st.error("No courses found. Upload syllabi first.")
@@ -166,15 +175,32 @@ with col1:
                 "work_ahead_days": int(assessment.get("work_ahead_days") or 0)
             })
         
-        # Update courses in session state
+        # Courses whose breakdown changed, with the new breakdown
+        changed_courses = {}
         for course_code, assessments_list in course_assessments.items():
-            if course_code in st.session_state["courses"]:
-                if "assessments" not in st.session_state["courses"][course_code]:
-                    st.session_state["courses"][course_code]["assessments"] = {}
-                st.session_state["courses"][course_code]["assessments"]["breakdown"] = assessments_list
+            course = st.session_state["courses"].get(course_code)
+            if course is not None and course.get("assessments", {}).get("breakdown") != assessments_list:
+                changed_courses[course_code] = {
+                    **course,
+                    "assessments": {**course.get("assessments", {}), "breakdown": assessments_list},
+                }
         
-        if "uid" in st.session_state:
-            save_courses(st.session_state["uid"], st.session_state["courses"])
+        if "uid" in st.session_state and changed_courses:
+            # Save each edited course on its own, so other sessions' edits to other
+            # courses survive. Queued whole-map saves would undo it when they land, so
+            # only save once they have been written.
+            uid = st.session_state["uid"]
+            
+            def save_changed_courses():
+                for course_code, course in changed_courses.items():
+                    upsert_course(uid, course_code, course)
+            
+            if not get_write_buffer().run_after_flush(uid, save_changed_courses):
+                st.error("Earlier changes are still waiting to be saved, so these were not saved. Please try again in a moment.")
+                st.stop()
+        
+        # Update courses in session state
+        st.session_state["courses"].update(changed_courses)
         
         st.session_state["original_assessments"] = [a.copy() for a in updated_assessments]
         
@@ -186,7 +212,12 @@ with col2:
     if selected_course != "All Courses":
         if st.button(f"Remove {selected_course}", type="secondary", use_container_width=True):
             if "uid" in st.session_state:
-                remove_course(st.session_state["uid"], selected_course)
+                # Queued course saves still hold this course and would bring it back, so
+                # only remove it once they have been written
+                uid = st.session_state["uid"]
+                if not get_write_buffer().run_after_flush(uid, lambda: remove_course(uid, selected_course)):
+                    st.error("Earlier changes are still waiting to be saved, so the course was not removed. Please try again in a moment.")
+                    st.stop()
             del st.session_state["courses"][selected_course]
             if "edited_assessments" in st.session_state:
                 del st.session_state["edited_assessments"]
@@ -199,13 +230,25 @@ st.divider()
 
 # Generate schedule
 if st.button("Generate Study Plan", type="primary", use_container_width=True):
-    optimizer = ScheduleOptimizer(
-        semester_start=semester_start,
-        semester_end=semester_end,
-        daily_hours=daily_hours,
-        work_ahead_days=work_ahead_days
-    )
-    schedule = optimizer.generate_raw_schedule(updated_assessments)
+    uid = st.session_state["uid"]
+    fingerprint = schedule_fingerprint(semester_start, semester_end, daily_hours, work_ahead_days, updated_assessments)
+    schedule = get_schedule_cache().get(uid, fingerprint)
+
+    if schedule is None:
+        # Reuse the optimizer while settings are unchanged so edits re-plan incrementally
+        optimizer_key = json.dumps([semester_start, semester_end, daily_hours, work_ahead_days], sort_keys=True)
+        optimizer = st.session_state.get("optimizer")
+        if optimizer is None or st.session_state.get("optimizer_key") != optimizer_key:
+            optimizer = ScheduleOptimizer(
+                semester_start=semester_start,
+                semester_end=semester_end,
+                daily_hours=daily_hours,
+                work_ahead_days=work_ahead_days
+            )
+            st.session_state["optimizer"] = optimizer
+            st.session_state["optimizer_key"] = optimizer_key
+        schedule = optimizer.replan(updated_assessments)
+        get_schedule_cache().put(uid, fingerprint, schedule)
     
     allocations = schedule.get("allocations", [])
     
@@ -248,8 +291,12 @@ if st.button("Generate Study Plan", type="primary", use_container_width=True):
                     st.write(f"   Only {p['scheduled']:.1f} of {p['required']:.1f} hours scheduled (missing {p['unscheduled']:.1f} hours)")
     
     st.session_state["schedule"] = schedule
-    if "uid" in st.session_state:
-        save_schedule(st.session_state["uid"], schedule)
+
+    # Skip the upload when this exact plan is the last one this session saved
+    saved_key = [uid, fingerprint]
+    if st.session_state.get("saved_schedule_key") != saved_key:
+        save_schedule(uid, schedule)
+        st.session_state["saved_schedule_key"] = saved_key
     
     if problems:
         fully_scheduled = len(updated_assessments) - len(problems)
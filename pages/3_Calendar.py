@@ -1,9 +1,10 @@
 import streamlit as st
-import pandas as pd
 import json
-from datetime import datetime, timedelta
-from backend.sb_functions import save_completions
-from utils.ics_exporter import schedule_to_ics
+from datetime import datetime
+from backend.write_behind import get_write_buffer
+from utils.due_dates import get_due_date_index
+from utils.ics_exporter import iter_ics
+from utils.schedule_view import ScheduleView
 
 
 # Format hours into readable format (e.g., "2 hours and 30 min")
@@ -45,9 +46,11 @@ if not days:
     st.error("Schedule is empty. Please re-run optimization.")
     st.stop()
 
-# Convert schedule to dataframe
-df = pd.DataFrame(days)
-df["date"] = pd.to_datetime(df["date"])
+# Week index over the schedule, rebuilt only when the schedule object is replaced
+view = st.session_state.get("schedule_view")
+if view is None or not view.is_for(schedule):
+    view = ScheduleView(schedule)
+    st.session_state["schedule_view"] = view
 
 # Initialize completions tracking
 if "completions" not in st.session_state:
@@ -170,22 +173,12 @@ div[data-testid="column"] button {
 if "calendar_week_index" not in st.session_state:
     st.session_state["calendar_week_index"] = 0
 
-# Calculate all weeks in the schedule
-start_date = df["date"].min()
-end_date = df["date"].max()
-
-all_weeks = []
-cursor = start_date
-while cursor <= end_date:
-    all_weeks.append(cursor)
-    cursor += timedelta(days=7)
-
-week_index = max(0, min(st.session_state["calendar_week_index"], len(all_weeks) - 1))
+week_index = max(0, min(st.session_state["calendar_week_index"], len(view) - 1))
 st.session_state["calendar_week_index"] = week_index
 
-# Get current week range
-current_week_start = all_weeks[week_index]
-current_week_end = current_week_start + timedelta(days=6)
+# Get current week
+current_week = view.week(week_index)
+current_week_start = current_week[0][0]
 
 st.header(f"Week of {current_week_start.strftime('%B %d, %Y')}")
 
@@ -201,56 +194,27 @@ with col1:
 
 with col2:
     if st.button("Jump to Today", use_container_width=False):
-        today = pd.Timestamp(datetime.now().date())
-        for i, week_start in enumerate(all_weeks):
-            week_end = week_start + timedelta(days=6)
-            if week_start <= today <= week_end:
-                st.session_state["calendar_week_index"] = i
-                st.rerun()
-                break
+        today_index = view.week_index_for(datetime.now().date())
+        if today_index is not None:
+            st.session_state["calendar_week_index"] = today_index
+            st.rerun()
 
 with col3:
-    if st.button("Next Week", use_container_width=False) and week_index < len(all_weeks) - 1:
+    if st.button("Next Week", use_container_width=False) and week_index < len(view) - 1:
         st.session_state["calendar_week_index"] += 1
         st.rerun()
 
-# Filter schedule for current week
-week_df = df[(df["date"] >= current_week_start) & (df["date"] <= current_week_end)]
-
 st.subheader("Weekly Overview")
 
-week_dates = list(pd.date_range(current_week_start, current_week_end))
-
-# Build due dates map from courses
+# Due dates from courses (parsed once per distinct course set)
 courses = st.session_state.get("courses", {})
-due_dates_map = {}
-
-for course_code, course_data in courses.items():
-    assessments = course_data.get("assessments", {}).get("breakdown", [])
-    for assessment in assessments:
-        due_date_str = assessment.get("due_date")
-        if not due_date_str:
-            continue
-        if "T" in due_date_str:
-            due_date = datetime.strptime(due_date_str, "%Y-%m-%dT%H:%M:%S").date()
-        else:
-            due_date = datetime.strptime(due_date_str, "%Y-%m-%d").date()
-        if due_date not in due_dates_map:
-            due_dates_map[due_date] = []
-        due_dates_map[due_date].append({
-            "course_code": course_code,
-            "type": assessment.get("type", "Assessment"),
-            "title": assessment.get("title", assessment.get("type", "Assessment")),
-            "due_date_str": due_date_str
-        })
+due_index = get_due_date_index(courses)
 
 # Build HTML for calendar cards
 cards_html = '<div class="calendar-container"><div class="card-container">'
 
-for day_date in week_dates:
-    day_rows = week_df[week_df["date"] == day_date]
-
-    is_today = day_date.date() == datetime.now().date()
+for day_date, day in current_week:
+    is_today = day_date == datetime.now().date()
     today_class = "today" if is_today else ""
 
     cards_html += f"""
@@ -261,63 +225,58 @@ for day_date in week_dates:
 
     # Add scheduled tasks for the day
     has_tasks = False
-    if not day_rows.empty:
-        for _, row in day_rows.iterrows():
-            for task in row["tasks"]:
-                has_tasks = True
-                formatted_time = format_hours(task["hours"])
-                due_date = task.get("due_date", "")
-
-                if due_date:
-                    try:
-                        if "T" in due_date:
-                            due = datetime.strptime(due_date, "%Y-%m-%dT%H:%M:%S")
-                            days_until = (due.date() - day_date.date()).days
-                            tooltip_text = (
-                                f"Due: {due.strftime('%B %d, %Y at %I:%M %p')} ({days_until} days)"
-                            )
-                        else:
-                            due = datetime.strptime(due_date, "%Y-%m-%d")
-                            days_until = (due.date() - day_date.date()).days
-                            tooltip_text = (
-                                f"Due: {due.strftime('%B %d, %Y')} ({days_until} days)"
-                            )
-                    except:
-                        tooltip_text = f"Due: {due_date}"
-                else:
-                    tooltip_text = "No due date"
-
-                cards_html += (
-                    f"<div class='task-text'>"
-                    f"• <b>{task['course_code']}</b><br>"
-                    f"{task['title']} ({formatted_time})"
-                    f"<span class='tooltip'>{tooltip_text}</span>"
-                    f"</div>"
-                )
-
-    # Add due date markers
-    day_date_only = day_date.date()
-    if day_date_only in due_dates_map:
-        for due_item in due_dates_map[day_date_only]:
+    if day:
+        for task in day.get("tasks", []):
             has_tasks = True
-            course_code = due_item["course_code"]
-            assessment_title = due_item.get("title", due_item["type"])
-            due_date_str = due_item["due_date_str"]
-
-            if "T" in due_date_str:
-                due_dt = datetime.strptime(due_date_str, "%Y-%m-%dT%H:%M:%S")
-                tooltip_text = f"Due at {due_dt.strftime('%I:%M %p')}"
+            formatted_time = format_hours(task["hours"])
+            due_date = task.get("due_date", "")
+
+            if due_date:
+                try:
+                    if "T" in due_date:
+                        due = datetime.strptime(due_date, "%Y-%m-%dT%H:%M:%S")
+                        days_until = (due.date() - day_date).days
+                        tooltip_text = (
+                            f"Due: {due.strftime('%B %d, %Y at %I:%M %p')} ({days_until} days)"
+                        )
+                    else:
+                        due = datetime.strptime(due_date, "%Y-%m-%d")
+                        days_until = (due.date() - day_date).days
+                        tooltip_text = (
+                            f"Due: {due.strftime('%B %d, %Y')} ({days_until} days)"
+                        )
+                except:
+                    tooltip_text = f"Due: {due_date}"
             else:
-                tooltip_text = "Due today"
+                tooltip_text = "No due date"
 
             cards_html += (
-                f"<div class='due-marker'>"
-                f"📌 <b>{course_code}</b><br>"
-                f"{assessment_title} DUE"
+                f"<div class='task-text'>"
+                f"• <b>{task['course_code']}</b><br>"
+                f"{task['title']} ({formatted_time})"
                 f"<span class='tooltip'>{tooltip_text}</span>"
                 f"</div>"
             )
 
+    # Add due date markers
+    for due_item in due_index.on(day_date):
+        has_tasks = True
+        course_code = due_item["course_code"]
+        assessment_title = due_item["title"]
+
+        if due_item["has_time"]:
+            tooltip_text = f"Due at {due_item['due'].strftime('%I:%M %p')}"
+        else:
+            tooltip_text = "Due today"
+
+        cards_html += (
+            f"<div class='due-marker'>"
+            f"📌 <b>{course_code}</b><br>"
+            f"{assessment_title} DUE"
+            f"<span class='tooltip'>{tooltip_text}</span>"
+            f"</div>"
+        )
+
     if not has_tasks:
         cards_html += "<div class='task-text'>No tasks.</div>"
 
@@ -333,12 +292,12 @@ st.subheader("Today's Tasks")
 # Display today's tasks with completion checkboxes
 today = datetime.now().date()
 today_str = today.strftime("%Y-%m-%d")
-today_schedule = [day for day in days if day["date"] == today_str]
+today_tasks = view.tasks_on(today)
 
-if today_schedule and today_schedule[0].get("tasks"):
+if today_tasks:
     completed_today = st.session_state["completions"].get(today_str, [])
 
-    for task in today_schedule[0]["tasks"]:
+    for task in today_tasks:
         task_id = f"{task['course_code']}-{task['title']}"
 
         is_completed = task_id in completed_today
@@ -356,7 +315,7 @@ if today_schedule and today_schedule[0].get("tasks"):
             st.session_state["completions"][today_str].append(task_id)
 
             if "uid" in st.session_state:
-                save_completions(st.session_state["uid"], st.session_state["completions"])
+                get_write_buffer().submit(st.session_state["uid"], "completions", st.session_state["completions"])
 
             st.success("Task completed!")
             st.rerun()
@@ -365,7 +324,7 @@ if today_schedule and today_schedule[0].get("tasks"):
             st.session_state["completions"][today_str].remove(task_id)
 
             if "uid" in st.session_state:
-                save_completions(st.session_state["uid"], st.session_state["completions"])
+                get_write_buffer().submit(st.session_state["uid"], "completions", st.session_state["completions"])
 
             st.rerun()
 else:
@@ -374,13 +333,24 @@ else:
 st.divider()
 st.subheader("Export Calendar")
 
-# Generate and provide ICS download
-courses = st.session_state.get("courses", {})
-ics_text = schedule_to_ics(schedule, courses)
-
-st.download_button(
-    label="Download as .ics file",
-    data=ics_text,
-    file_name="study_schedule.ics",
-    mime="text/calendar",
-)
\ No newline at end of file
+# Build the .ics file only when asked; keep it until the schedule or courses change
+courses_key = due_index.fingerprint
+export = st.session_state.get("ics_export")
+if export is not None and (export["schedule"] is not schedule or export["courses"] != courses_key):
+    export = None
+
+if export is None and st.button("Prepare .ics file"):
+    export = {
+        "schedule": schedule,
+        "courses": courses_key,
+        "data": b"".join(iter_ics(schedule, courses)),
+    }
+    st.session_state["ics_export"] = export
+
+if export is not None:
+    st.download_button(
+        label="Download as .ics file",
+        data=export["data"],
+        file_name="study_schedule.ics",
+        mime="text/calendar",
+    )
\ No newline at end of file
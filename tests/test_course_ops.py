@@ -0,0 +1,46 @@
+import pytest
+
+pytest.importorskip("streamlit")
+pytest.importorskip("supabase")
+
+from backend import sb_functions
+from backend.fakes import FakeSupabaseClient
+from backend.supabase_client import use_client
+
+
+@pytest.fixture(
+    params=[
+        {"versioned": True},
+        # delta_saves.sql missing: the course functions fail on the version column
+        {"versioned": False},
+        # course_ops.sql missing
+        {"versioned": True, "functions": {"upsert_course": None, "remove_course": None}},
+    ],
+    ids=["installed", "no-version-column", "no-course-ops"],
+)
+def client(request):
+    client = FakeSupabaseClient(**request.param)
+    use_client(client)
+    yield client
+    use_client(None)
+
+
+def stored_courses(client, uid):
+    return client.tables["user_courses"][(uid,)]["courses_json"]
+
+
+def test_course_edits(client):
+    sb_functions.save_courses("u", {"A": {"x": 1}, "B": {"x": 2}})
+
+    sb_functions.upsert_course("u", "C", {"x": 3})
+    sb_functions.remove_course("u", "A")
+    assert stored_courses(client, "u") == {"B": {"x": 2}, "C": {"x": 3}}
+
+    # The delta-save base still matches what was stored
+    sb_functions.save_courses("u", {"B": {"x": 5}, "C": {"x": 3}})
+    assert stored_courses(client, "u") == {"B": {"x": 5}, "C": {"x": 3}}
+
+
+def test_remove_course_without_row(client):
+    assert sb_functions.remove_course("nobody", "A") is None
+    assert ("nobody",) not in client.tables.get("user_courses", {})
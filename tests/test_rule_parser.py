@@ -0,0 +1,31 @@
+import pytest
+
+from backend.rule_parser import parse_grading_table
+
+
+SYLLABUS = """CP317 Software Engineering
+Fall 2025
+{instructor}
+
+Assignment 1 ..... 20% ..... Oct 5
+Assignment 2 ..... 20% ..... Nov 2
+Midterm Exam ..... 25% ..... Oct 22
+Final Exam ....... 35% ..... Dec 12
+"""
+
+
+@pytest.mark.parametrize("line, name", [
+    ("Instructor: Jane Smith  jsmith@wlu.ca", "Jane Smith"),
+    ("Professor John Doe office hours", "John Doe"),
+    ("INSTRUCTOR: Dr. Mary-Ann O'Neil", "Mary-Ann O'Neil"),
+    ("Lecturer: prof. Wei Zhang Li, room 3005", "Wei Zhang Li"),
+])
+def test_instructor_name_stops_at_the_name(line, name):
+    data, confidence = parse_grading_table(SYLLABUS.format(instructor=line), "2025-09-02", "2025-12-20")
+    assert data["course_info"]["instructor"]["name"] == name
+    assert confidence == 1.0
+
+
+def test_instructor_email():
+    data, _ = parse_grading_table(SYLLABUS.format(instructor="Instructor: Jane Smith  jsmith@wlu.ca"), "2025-09-02", "2025-12-20")
+    assert data["course_info"]["instructor"]["email"] == "jsmith@wlu.ca"
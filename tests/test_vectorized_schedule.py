@@ -0,0 +1,101 @@
+import json
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from backend.schedule import DAY_NAMES, ScheduleOptimizer, VectorizedScheduleOptimizer, generate_many
+from benchmarks.generators import make_plan
+
+
+TYPES = ["assignment", "quiz", "midterm", "final", "lab", "project"]
+
+
+def random_plan(rng):
+    # Odd capacities, windows running past either end of the semester, missing dates and
+    # zero or fractional hours, to exercise every branch of the greedy fill
+    start = date(2025, 9, 1) + timedelta(days=rng.randint(0, 30))
+    end = start + timedelta(days=rng.randint(0, 200))
+    daily_hours = {d: rng.choice([0, 0, 0.5, 1, 1.25, 1.3, 2, 3, 4.75]) for d in DAY_NAMES}
+    work_ahead_days = {t: rng.randint(0, 20) for t in TYPES}
+
+    assessments = []
+    for i in range(rng.randint(0, 40)):
+        due = start + timedelta(days=rng.randint(-10, (end - start).days + 10))
+        due_date = due.isoformat() if rng.random() < 0.7 else due.isoformat() + "T23:59:00"
+        assessments.append({
+            "course_code": f"C{rng.randint(1, 5)}",
+            "type": rng.choice(TYPES),
+            "title": f"T{i}",
+            "due_date": due_date if rng.random() < 0.95 else None,
+            "hours_required": rng.choice([0, 1, 2, 3, 3.3, 3.8, 5, 12, 0.2, 0.75, 20]),
+            "work_ahead_days": rng.choice([None, rng.randint(0, 15)]),
+        })
+
+    return start.isoformat(), end.isoformat(), daily_hours, work_ahead_days, assessments
+
+
+def both(start, end, daily_hours, work_ahead_days, assessments):
+    expected = ScheduleOptimizer(start, end, daily_hours, work_ahead_days).generate_raw_schedule(assessments)
+    actual = VectorizedScheduleOptimizer(start, end, daily_hours, work_ahead_days).generate_raw_schedule(assessments)
+    return expected, actual
+
+
+@pytest.mark.parametrize("seed", range(6))
+def test_matches_greedy_on_random_plans(seed):
+    rng = random.Random(seed)
+    for _ in range(500):
+        expected, actual = both(*random_plan(rng))
+        assert json.dumps(actual, sort_keys=True) == json.dumps(expected, sort_keys=True)
+
+
+@pytest.mark.parametrize("profile", ["light", "weekday", "heavy"])
+def test_matches_greedy_on_generated_plans(profile):
+    plan = make_plan(7, n_courses=10, n_terms=3, profile=profile)
+    expected, actual = both(
+        plan["semester_start"], plan["semester_end"], plan["daily_hours"], plan["work_ahead_days"], plan["assessments"]
+    )
+    assert actual == expected
+
+
+def test_unusual_due_dates_fall_back_to_strptime():
+    assessments = [
+        {"type": "quiz", "due_date": "2025-9-15", "hours_required": 2},
+        {"type": "quiz", "due_date": "2025-09-20T09:00:00", "hours_required": 3},
+    ]
+    expected, actual = both("2025-09-01", "2025-12-15", {"monday": 2, "wednesday": 1}, {"quiz": 7}, assessments)
+    assert actual == expected
+
+
+@pytest.mark.parametrize("due_date", ["2025-02-30", "2025-09-20T24:00:00", "2025-09-20T10:00:60", "next week"])
+def test_invalid_due_dates_raise_like_greedy(due_date):
+    args = ("2025-01-06", "2025-04-30", {"monday": 2}, {}, [{"type": "lab", "due_date": due_date, "hours_required": 1}])
+    with pytest.raises(ValueError):
+        ScheduleOptimizer(*args[:4]).generate_raw_schedule(args[4])
+    with pytest.raises(ValueError):
+        VectorizedScheduleOptimizer(*args[:4]).generate_raw_schedule(args[4])
+
+
+def test_replan_matches_a_fresh_run():
+    start, end, daily_hours, work_ahead_days, assessments = random_plan(random.Random(42))
+    optimizer = VectorizedScheduleOptimizer(start, end, daily_hours, work_ahead_days)
+    optimizer.generate_raw_schedule(assessments)
+    edited = [dict(a, hours_required=a["hours_required"] + 1) for a in assessments]
+    assert optimizer.replan(edited) == ScheduleOptimizer(start, end, daily_hours, work_ahead_days).generate_raw_schedule(edited)
+
+
+def test_strategy_argument():
+    VectorizedScheduleOptimizer("2025-09-01", "2025-12-15", {}, {}, strategy="greedy")
+    with pytest.raises(ValueError):
+        VectorizedScheduleOptimizer("2025-09-01", "2025-12-15", {}, {}, strategy="edf")
+
+
+def test_generate_many_with_strategy_jobs():
+    job = make_plan(3, n_courses=4)
+    jobs = [dict(job, user_id="a"), dict(job, user_id="b", strategy="greedy"), dict(job, user_id="c", strategy="flow")]
+
+    results = generate_many(jobs, workers=1, optimizer_cls=VectorizedScheduleOptimizer)
+
+    assert [r["ok"] for r in results] == [True, True, False]
+    assert results[0]["schedule"] == results[1]["schedule"]
+    assert "greedy" in results[2]["error"]
@@ -0,0 +1,76 @@
+import time
+
+import pytest
+
+pytest.importorskip("streamlit")
+pytest.importorskip("supabase")
+
+from backend.write_behind import WriteBehindBuffer
+
+
+def flaky_writer(failures, written):
+    def write(uid, payload):
+        if failures[0]:
+            failures[0] -= 1
+            raise RuntimeError("transient")
+        written.append((uid, payload))
+    return write
+
+
+def test_flush_retries_failed_write_until_it_lands():
+    written = []
+    buffer = WriteBehindBuffer({"courses": flaky_writer([3], written)}, delay=5, backoff=0.05)
+    buffer.submit("u", "courses", {"v": 1})
+
+    assert buffer.flush("u", timeout=3)
+    assert written == [("u", {"v": 1})]
+    buffer.close()
+
+
+def test_flush_gives_up_at_timeout_and_keeps_entry_queued():
+    written = []
+    failures = [10 ** 9]
+    buffer = WriteBehindBuffer({"courses": flaky_writer(failures, written)}, delay=5, backoff=0.05)
+    buffer.submit("u", "courses", {"v": 1})
+
+    started = time.monotonic()
+    assert not buffer.flush("u", timeout=0.5)
+    assert time.monotonic() - started >= 0.5
+
+    failures[0] = 0
+    assert buffer.flush("u", timeout=3)
+    assert written == [("u", {"v": 1})]
+    buffer.close()
+
+
+def test_course_removal_waits_for_queued_course_saves():
+    from backend.fakes import FakeSupabaseClient
+    from backend.sb_functions import remove_course, save_courses
+    from backend.supabase_client import use_client
+
+    client = FakeSupabaseClient(versioned=True)
+    use_client(client)
+    failures = [10 ** 9]
+
+    def flaky_save_courses(uid, courses):
+        if failures[0]:
+            failures[0] -= 1
+            raise RuntimeError("transient")
+        save_courses(uid, courses)
+
+    buffer = WriteBehindBuffer({"courses": flaky_save_courses}, delay=5, backoff=0.05)
+    try:
+        save_courses("u", {"A": {}})
+        buffer.submit("u", "courses", {"A": {}, "B": {}})
+
+        # The queued map still holds B, so removing B now would be undone when it lands
+        assert not buffer.run_after_flush("u", lambda: remove_course("u", "B"), timeout=0.3)
+        assert client.tables["user_courses"][("u",)]["courses_json"] == {"A": {}}
+
+        failures[0] = 0
+        assert buffer.run_after_flush("u", lambda: remove_course("u", "B"), timeout=3)
+        time.sleep(0.2)
+        assert client.tables["user_courses"][("u",)]["courses_json"] == {"A": {}}
+    finally:
+        buffer.close()
+        use_client(None)
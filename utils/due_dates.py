@@ -0,0 +1,108 @@
+import bisect
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from datetime import date, datetime, time
+from typing import Any, Dict, List, Optional
+
+
+# Parsed due dates of every assessment in a courses dict, shared by the Calendar page
+# and the .ics exporter. Indexes are memoized by a hash of the courses contents, so
+# each due date is parsed once per distinct course set rather than on every rerun.
+# An index keeps that hash as `fingerprint`, for callers caching other per-courses work.
+#
+# Each entry is a plain dict (copied out of courses, so later edits to the session's
+# courses cannot leak into a cached index):
+#
+#   course_code, course_name, type, title, weight, notes,
+#   due_date_str   the original string
+#   due            datetime; date-only due dates are due at 23:59
+#   date           due.date()
+#   has_time       whether due_date_str had a time
+
+INDEX_CACHE_SIZE = 64
+
+
+def parse_due_date(value: str) -> Optional[datetime]:
+    try:
+        if "T" in value:
+            return datetime.strptime(value, "%Y-%m-%dT%H:%M:%S")
+        return datetime.combine(datetime.strptime(value, "%Y-%m-%d").date(), time(23, 59, 0))
+    except ValueError:
+        return None
+
+
+class DueDateIndex:
+
+    def __init__(self, courses: Dict[str, Any], fingerprint: Optional[str] = None):
+        self.fingerprint = fingerprint if fingerprint is not None else courses_fingerprint(courses)
+        self.entries: List[Dict[str, Any]] = []  # courses order, then breakdown order
+        self.by_date: Dict[date, List[Dict[str, Any]]] = {}
+        self.by_course: Dict[str, List[Dict[str, Any]]] = {}
+
+        for course_code, course_data in (courses or {}).items():
+            course_name = course_data.get("course_info", {}).get("course_name", "")
+            for assessment in course_data.get("assessments", {}).get("breakdown", []):
+                due_date_str = assessment.get("due_date")
+                if not due_date_str:
+                    continue
+                due = parse_due_date(due_date_str)
+                if due is None:
+                    continue
+
+                assessment_type = assessment.get("type", "Assessment")
+                entry = {
+                    "course_code": course_code,
+                    "course_name": course_name,
+                    "type": assessment_type,
+                    "title": assessment.get("title", assessment_type),
+                    "weight": assessment.get("weight", 0),
+                    "notes": assessment.get("notes"),
+                    "due_date_str": due_date_str,
+                    "due": due,
+                    "date": due.date(),
+                    "has_time": "T" in due_date_str,
+                }
+                self.entries.append(entry)
+                self.by_date.setdefault(entry["date"], []).append(entry)
+                self.by_course.setdefault(course_code, []).append(entry)
+
+        self._dates = sorted(self.by_date)
+
+    def on(self, day: date) -> List[Dict[str, Any]]:
+        return self.by_date.get(day, [])
+
+    def between(self, start: date, end: date) -> List[Dict[str, Any]]:
+        # Inclusive range, ordered by date
+        lo = bisect.bisect_left(self._dates, start)
+        hi = bisect.bisect_right(self._dates, end)
+        return [entry for day in self._dates[lo:hi] for entry in self.by_date[day]]
+
+    def for_course(self, course_code: str) -> List[Dict[str, Any]]:
+        return self.by_course.get(course_code, [])
+
+
+def courses_fingerprint(courses: Dict[str, Any]) -> str:
+    data = json.dumps(courses or {}, sort_keys=True, default=str)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+_indexes: "OrderedDict[str, DueDateIndex]" = OrderedDict()
+_indexes_lock = threading.Lock()
+
+
+def get_due_date_index(courses: Dict[str, Any]) -> DueDateIndex:
+    key = courses_fingerprint(courses)
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is not None:
+            _indexes.move_to_end(key)
+            return index
+
+    index = DueDateIndex(courses, key)
+    with _indexes_lock:
+        _indexes[key] = index
+        while len(_indexes) > INDEX_CACHE_SIZE:
+            _indexes.popitem(last=False)
+    return index
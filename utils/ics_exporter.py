@@ -1,19 +1,66 @@
 from datetime import datetime, date, time, timedelta
-from typing import Dict, Any, List
+from typing import Dict, Any, Iterator, List
+
+from utils.due_dates import get_due_date_index
+
+
+# RFC 5545 limits content lines to 75 octets (excluding CRLF); longer lines continue
+# on lines that start with a single space
+MAX_LINE_OCTETS = 75
+CHUNK_SIZE = 64 * 1024
+
+
+def fold_line(line: str) -> bytes:
+    data = line.encode("utf-8")
+    if len(data) <= MAX_LINE_OCTETS:
+        return data + b"\r\n"
+
+    parts = []
+    start = 0
+    limit = MAX_LINE_OCTETS
+    while start < len(data):
+        end = min(start + limit, len(data))
+        # Never split a multi-byte UTF-8 character across lines
+        while end < len(data) and (data[end] & 0xC0) == 0x80:
+            end -= 1
+        parts.append(data[start:end])
+        start = end
+        limit = MAX_LINE_OCTETS - 1  # the leading space counts
+    return b"\r\n ".join(parts) + b"\r\n"
+
+
+def iter_ics(schedule: Dict[str, Any],
+             courses: Dict[str, Any] = None,
+             calendar_name: str = "Study Schedule",
+             chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    # Yields the calendar as UTF-8 chunks of about chunk_size bytes, so the whole file
+    # never has to exist as a list of lines plus one big string
+    buffer = bytearray()
+    for line in _iter_lines(schedule, courses, calendar_name):
+        buffer += fold_line(line)
+        if len(buffer) >= chunk_size:
+            yield bytes(buffer)
+            buffer.clear()
+    if buffer:
+        yield bytes(buffer)
 
 
 def schedule_to_ics(schedule: Dict[str, Any],
                     courses: Dict[str, Any] = None,
                     calendar_name: str = "Study Schedule") -> str:
+    return b"".join(iter_ics(schedule, courses, calendar_name)).decode("utf-8")
+
+
+def _iter_lines(schedule: Dict[str, Any],
+                courses: Dict[str, Any] = None,
+                calendar_name: str = "Study Schedule") -> Iterator[str]:
 
     days: List[Dict[str, Any]] = schedule.get("days", [])
 
-    lines = [
-        "BEGIN:VCALENDAR",
-        "VERSION:2.0",
-        "PRODID:-//SyllabusPlanner//EN",
-        f"X-WR-CALNAME:{calendar_name}",
-    ]
+    yield "BEGIN:VCALENDAR"
+    yield "VERSION:2.0"
+    yield "PRODID:-//SyllabusPlanner//EN"
+    yield f"X-WR-CALNAME:{calendar_name}"
 
     now_utc = datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")
 
@@ -45,7 +92,7 @@ def schedule_to_ics(schedule: Dict[str, Any],
                 f"{t.get('assessment_id', 0)}-{minutes}@syllabusplanner"
             )
 
-            lines.extend([
+            yield from [
                 "BEGIN:VEVENT",
                 f"UID:{uid}",
                 f"DTSTAMP:{now_utc}",
@@ -54,61 +101,43 @@ def schedule_to_ics(schedule: Dict[str, Any],
                 f"SUMMARY:{summary}",
                 f"DESCRIPTION:{description}",
                 "END:VEVENT",
-            ])
+            ]
 
             current_start = dt_end
 
-    # Process due date events
+    # Process due date events (date-only due dates are due at 11:59 PM)
     if courses:
-        for course_code, course_data in courses.items():
-            assessments = course_data.get("assessments", {}).get("breakdown", [])
-            
-            for assessment in assessments:
-                due_date_str = assessment.get("due_date")
-                if not due_date_str:
-                    continue
-                
-                # Parse due date (with or without time)
-                if "T" in due_date_str:
-                    # Has time: "2025-11-25T23:59:00"
-                    due_dt = datetime.strptime(due_date_str, "%Y-%m-%dT%H:%M:%S")
-                else:
-                    # Date only: "2025-11-25" - default to 11:59 PM
-                    due_date = datetime.strptime(due_date_str, "%Y-%m-%d")
-                    due_dt = datetime.combine(due_date.date(), time(23, 59, 0))
-                
-                # Create due date event (1 minute duration)
-                dt_start = due_dt
-                dt_end = due_dt + timedelta(minutes=1)
-                
-                assessment_type = assessment.get("type", "Assessment")
-                summary = f"DUE: {course_code} – {assessment_type}"
-                
-                description_parts = [
-                    f"Course: {course_data.get('course_info', {}).get('course_name', '')}",
-                    f"Type: {assessment_type}",
-                    f"Weight: {assessment.get('weight', 0)}%",
-                ]
-                
-                notes = assessment.get("notes")
-                if notes:
-                    description_parts.append(f"Notes: {notes}")
-                
-                description = "\\n".join(description_parts)
-                
-                uid = f"due-{course_code}-{assessment_type}-{due_date_str}@syllabusplanner"
-                
-                lines.extend([
-                    "BEGIN:VEVENT",
-                    f"UID:{uid}",
-                    f"DTSTAMP:{now_utc}",
-                    f"DTSTART:{dt_start.strftime('%Y%m%dT%H%M%S')}",
-                    f"DTEND:{dt_end.strftime('%Y%m%dT%H%M%S')}",
-                    f"SUMMARY:{summary}",
-                    f"DESCRIPTION:{description}",
-                    "END:VEVENT",
-                ])
-
-    lines.append("END:VCALENDAR")
-
-    return "\r\n".join(lines)
\ No newline at end of file
+        for due in get_due_date_index(courses).entries:
+            # Create due date event (1 minute duration)
+            dt_start = due["due"]
+            dt_end = dt_start + timedelta(minutes=1)
+
+            course_code = due["course_code"]
+            assessment_type = due["type"]
+            summary = f"DUE: {course_code} – {assessment_type}"
+
+            description_parts = [
+                f"Course: {due['course_name']}",
+                f"Type: {assessment_type}",
+                f"Weight: {due['weight']}%",
+            ]
+
+            if due["notes"]:
+                description_parts.append(f"Notes: {due['notes']}")
+
+            description = "\\n".join(description_parts)
+
+            uid = f"due-{course_code}-{assessment_type}-{due['due_date_str']}@syllabusplanner"
+
+            yield from [
+                "BEGIN:VEVENT",
+                f"UID:{uid}",
+                f"DTSTAMP:{now_utc}",
+                f"DTSTART:{dt_start.strftime('%Y%m%dT%H%M%S')}",
+                f"DTEND:{dt_end.strftime('%Y%m%dT%H%M%S')}",
+                f"SUMMARY:{summary}",
+                f"DESCRIPTION:{description}",
+                "END:VEVENT",
+            ]
+
+    yield "END:VCALENDAR"
\ No newline at end of file
@@ -0,0 +1,151 @@
+from datetime import date, timedelta
+from typing import Any, Dict, List
+
+from backend.schedule import DAY_NAMES
+
+
+# Compact columnar form of a generate_raw_schedule() result. Instead of repeating
+# course_code/type/title/due_date on every half-hour block, tasks point at a shared
+# assessment table by integer id, and days/tasks/allocations are parallel arrays:
+#
+# {
+#     "format": "columnar/v1",
+#     "start": "YYYY-MM-DD",                    # date of day offset 0
+#     "days": {"offset": [], "available_hours": [], "scheduled_hours": []},
+#     "assessments": {"assessment_id": [], "course_code": [], "type": [], "title": [], "due_date": []},
+#     "tasks": {"day": [], "assessment": [], "hours": []},   # day offset, assessment table row
+#     "allocations": {"assessment_id": [], "scheduled_hours": [], "unscheduled_hours": [], "status": []},
+# }
+
+COLUMNAR_FORMAT = "columnar/v1"
+
+TASK_FIELDS = ("assessment_id", "course_code", "type", "title", "due_date")
+ALLOCATION_FIELDS = ("assessment_id", "scheduled_hours", "unscheduled_hours", "status")
+
+
+def is_columnar(schedule: Dict[str, Any]) -> bool:
+    return isinstance(schedule, dict) and schedule.get("format") == COLUMNAR_FORMAT
+
+
+def to_columnar(schedule: Dict[str, Any]) -> Dict[str, Any]:
+    if is_columnar(schedule):
+        return schedule
+
+    days: List[Dict[str, Any]] = schedule.get("days", [])
+    start = date.fromisoformat(days[0]["date"]) if days else None
+
+    day_cols = {"offset": [], "available_hours": [], "scheduled_hours": []}
+    table = {k: [] for k in TASK_FIELDS}
+    task_cols = {"day": [], "assessment": [], "hours": []}
+    rows: Dict[tuple, int] = {}
+
+    for day in days:
+        offset = (date.fromisoformat(day["date"]) - start).days
+        day_cols["offset"].append(offset)
+        day_cols["available_hours"].append(day.get("available_hours"))
+        day_cols["scheduled_hours"].append(day.get("scheduled_hours"))
+
+        for t in day.get("tasks", []):
+            key = tuple(t.get(k) for k in TASK_FIELDS)
+            row = rows.get(key)
+            if row is None:
+                row = rows[key] = len(rows)
+                for k, v in zip(TASK_FIELDS, key):
+                    table[k].append(v)
+            task_cols["day"].append(offset)
+            task_cols["assessment"].append(row)
+            task_cols["hours"].append(t.get("hours"))
+
+    allocations = schedule.get("allocations", [])
+    alloc_cols = {k: [a.get(k) for a in allocations] for k in ALLOCATION_FIELDS}
+
+    return {
+        "format": COLUMNAR_FORMAT,
+        "start": start.isoformat() if start else None,
+        "days": day_cols,
+        "assessments": table,
+        "tasks": task_cols,
+        "allocations": alloc_cols,
+    }
+
+
+def from_columnar(data: Dict[str, Any]) -> Dict[str, Any]:
+    if not is_columnar(data):
+        return data
+
+    start = date.fromisoformat(data["start"]) if data.get("start") else None
+    day_cols = data["days"]
+    table = data["assessments"]
+    task_cols = data["tasks"]
+
+    day_entries = []
+    by_offset: Dict[int, List[Dict[str, Any]]] = {}
+    for offset, available, scheduled in zip(day_cols["offset"], day_cols["available_hours"], day_cols["scheduled_hours"]):
+        current = start + timedelta(days=offset)
+        tasks: List[Dict[str, Any]] = []
+        by_offset[offset] = tasks
+        day_entries.append({
+            "date": current.isoformat(),
+            "weekday": DAY_NAMES[current.weekday()],
+            "available_hours": available,
+            "scheduled_hours": scheduled,
+            "tasks": tasks,
+        })
+
+    for offset, row, hours in zip(task_cols["day"], task_cols["assessment"], task_cols["hours"]):
+        task = {k: table[k][row] for k in TASK_FIELDS}
+        task["hours"] = hours
+        by_offset[offset].append(task)
+
+    alloc_cols = data["allocations"]
+    allocations = [dict(zip(ALLOCATION_FIELDS, values)) for values in zip(*(alloc_cols[k] for k in ALLOCATION_FIELDS))]
+
+    return {
+        "days": day_entries,
+        "allocations": allocations,
+    }
+
+
+# Row form for the per-day tables in backend/sql/relational_schedule.sql: one row per
+# day, one per task (position = order within its day) and one per allocation.
+
+DAY_ROW_FIELDS = ("date", "weekday", "available_hours", "scheduled_hours")
+
+
+def to_rows(schedule: Dict[str, Any]) -> Dict[str, List[Dict[str, Any]]]:
+    schedule = from_columnar(schedule)
+    days = []
+    tasks = []
+    for day in schedule.get("days", []):
+        days.append({k: day.get(k) for k in DAY_ROW_FIELDS})
+        for position, t in enumerate(day.get("tasks", [])):
+            row = {"date": day["date"], "position": position}
+            row.update({k: t.get(k) for k in TASK_FIELDS})
+            row["hours"] = t.get("hours")
+            tasks.append(row)
+
+    allocations = [{k: a.get(k) for k in ALLOCATION_FIELDS} for a in schedule.get("allocations", [])]
+    return {"days": days, "tasks": tasks, "allocations": allocations}
+
+
+def from_rows(days: List[Dict[str, Any]], tasks: List[Dict[str, Any]], allocations: List[Dict[str, Any]] = None) -> Dict[str, Any]:
+    # Rows may come back in any order; days are sorted by date, tasks by position
+    by_date: Dict[str, List[Dict[str, Any]]] = {}
+    for row in sorted(tasks, key=lambda r: (r["date"], r["position"])):
+        task = {k: row.get(k) for k in TASK_FIELDS}
+        task["hours"] = row.get("hours")
+        by_date.setdefault(row["date"], []).append(task)
+
+    day_entries = []
+    for row in sorted(days, key=lambda r: r["date"]):
+        entry = {k: row.get(k) for k in DAY_ROW_FIELDS}
+        entry["tasks"] = by_date.get(row["date"], [])
+        day_entries.append(entry)
+
+    schedule = {"days": day_entries}
+    if allocations is not None:
+        schedule["allocations"] = [
+            {k: a.get(k) for k in ALLOCATION_FIELDS}
+            for a in sorted(allocations, key=lambda a: a["assessment_id"])
+        ]
+    return schedule
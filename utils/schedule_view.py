@@ -0,0 +1,55 @@
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+
+# Read-only index over a generate_raw_schedule() result for the Calendar page. Built
+# once per schedule object; week navigation and per-day lookups are then dict and list
+# indexing instead of a pass over the whole semester.
+#
+# Weeks start on the schedule's first day, in 7-day steps up to its last day.
+
+
+class ScheduleView:
+
+    def __init__(self, schedule: Dict[str, Any]):
+        self.schedule = schedule
+        self.days_by_date: Dict[date, Dict[str, Any]] = {
+            date.fromisoformat(day["date"]): day for day in schedule.get("days", [])
+        }
+
+        self.week_starts: List[date] = []
+        self.weeks: Dict[date, List[Tuple[date, Optional[Dict[str, Any]]]]] = {}
+        if not self.days_by_date:
+            self.start = self.end = None
+            return
+
+        self.start = min(self.days_by_date)
+        self.end = max(self.days_by_date)
+        cursor = self.start
+        while cursor <= self.end:
+            self.week_starts.append(cursor)
+            self.weeks[cursor] = [
+                (cursor + timedelta(days=i), self.days_by_date.get(cursor + timedelta(days=i)))
+                for i in range(7)
+            ]
+            cursor += timedelta(days=7)
+
+    def is_for(self, schedule: Dict[str, Any]) -> bool:
+        return self.schedule is schedule
+
+    def __len__(self) -> int:
+        return len(self.week_starts)
+
+    def week(self, index: int) -> List[Tuple[date, Optional[Dict[str, Any]]]]:
+        # (date, day entry or None) for each of the 7 days of week `index`
+        return self.weeks[self.week_starts[index]]
+
+    def week_index_for(self, day: date) -> Optional[int]:
+        if self.start is None or day < self.start:
+            return None
+        index = (day - self.start).days // 7
+        return index if index < len(self.week_starts) else None
+
+    def tasks_on(self, day: date) -> List[Dict[str, Any]]:
+        entry = self.days_by_date.get(day)
+        return entry.get("tasks", []) if entry else []